@@ -14,3 +14,32 @@ from .playlists import *
 from .shop import *
 from .stats import *
 from .cosmetics import *
+from .pool import *
+from .compression import TransferStats
+from .ratelimit import *
+from .retry import *
+from .hedging import *
+from .keys import *
+from .failover import *
+from .scheduler import (
+    RequestScheduler,
+    AdaptiveLimit,
+    PriorityStats,
+    TenantStats,
+    Ticket
+)
+from .options import RequestOptions, request_options
+from .bulk import BulkResult
+from .cache import (
+    CacheEntry,
+    CachePolicy,
+    ResponseCache,
+    TTL_CACHE_POLICIES
+)
+from .storage import Storage, SQLiteStorage, RedisStorage
+from .transport import (
+    Transport,
+    TransportResponse,
+    AiohttpTransport,
+    HTTPXTransport
+)
@@ -5,7 +5,8 @@ from .enums import (
     StatsTimeWindow,
     StatsImage,
     AccountType,
-    ResponseFlags
+    ResponseFlags,
+    Priority
 )
 from .aes import AESKeys
 from .creator_code import CreatorCode
@@ -15,15 +16,39 @@ from .playlists import Playlist
 from .stats import Stats
 from .banners import Banner, BannerColor
 from .shop import Shop
-from .utils import combine_flags
+from .utils import ListOf, combine_flags
+from .keys import APIKeyPool
+from .bulk import BulkResult, iter_bulk
+from .options import default_options
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Union
+)
+
+import os
 
 
 class APIClient:
-    def __init__(self, api_key: str = None, **kwargs) -> None:
+    def __init__(self,
+                 api_key: str = None,
+                 api_keys: Union[Iterable[str], APIKeyPool] = None,
+                 **kwargs
+                 ) -> None:
+        if api_keys is not None and not isinstance(api_keys, APIKeyPool):
+            api_keys = APIKeyPool(api_keys)
+
         self.http = HTTPClient(
             headers={
                 "Authorization": api_key
             } if api_key is not None else {},
+            key_pool=api_keys,
             **kwargs
         )
 
@@ -31,6 +56,7 @@ class APIClient:
 
     async def __aenter__(self) -> 'APIClient':
         await self.http.set_session()
+        await self.http.warm_up()
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
@@ -39,8 +65,169 @@ class APIClient:
     async def close(self) -> None:
         await self.http.close()
 
+    async def get_raw(self,
+                      url: str,
+                      params: dict = None,
+                      timeout: float = None
+                      ) -> bytes:
+        """|coro|
+
+        Returns the undecoded response body of any endpoint, skipping JSON
+        decoding and object construction.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The endpoint path, e.g. `/v2/cosmetics`.
+        params: Optional[:class:`dict`]
+            Query parameters to send.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
+
+        Returns
+        -------
+        :class:`bytes`
+        """
+        return await self.http.api_request(
+            url=url,
+            params=params,
+            raw=True,
+            timeout=timeout
+        )
+
+    async def download(self,
+                       url: str,
+                       sink: Union[str, os.PathLike, Any],
+                       params: dict = None,
+                       chunk_size: int = 65536,
+                       timeout: float = None
+                       ) -> int:
+        """|coro|
+
+        Streams the response body of any endpoint into a file or sink in
+        chunks, without holding the whole body in memory.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The endpoint path, e.g. `/v2/cosmetics`.
+        sink: Union[:class:`str`, :class:`os.PathLike`, Any]
+            A path to write to, an object with a (sync or async) `write`
+            method, or a (sync or async) callable taking each chunk.
+        params: Optional[:class:`dict`]
+            Query parameters to send.
+        chunk_size: Optional[:class:`int`]
+            Maximum size of each chunk in bytes.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds to wait for the response to start,
+            including retries and waiting on rate limits. Defaults to the
+            endpoint's timeout.
+
+        Returns
+        -------
+        :class:`int`
+            Number of bytes written.
+        """
+        return await self.http.stream_request(
+            url=url,
+            sink=sink,
+            params=params,
+            chunk_size=chunk_size,
+            timeout=timeout
+        )
+
+    async def bulk(self,
+                   func: Callable[[Any], Awaitable[Any]],
+                   items: Iterable[Any],
+                   concurrency: int = 10,
+                   progress: Callable[[int, Optional[int]], Any] = None,
+                   priority: Priority = Priority.BACKGROUND
+                   ) -> AsyncIterator[BulkResult]:
+        """Calls ``func`` with every item, at most ``concurrency`` at once,
+        and yields the result of each call as soon as it completes.
+
+        A failing call doesn't stop the others, its error is returned in
+        its :class:`BulkResult` instead.
+
+        .. code-block:: python3
+
+            async for result in client.bulk(client.get_stats_by_id, ids):
+                if result.ok:
+                    print(result.result.display_name, result.result.level)
+
+        Parameters
+        ----------
+        func: Callable[[Any], Awaitable[Any]]
+            The coroutine function to call, e.g. :meth:`get_stats_by_id`.
+            Use :func:`functools.partial` to pass other arguments.
+        items: Iterable[Any]
+            The items to call ``func`` with, taken lazily.
+        concurrency: Optional[:class:`int`]
+            Maximum number of calls running at once.
+        progress: Optional[Callable[[:class:`int`, Optional[:class:`int`]], Any]]
+            A (sync or async) callable taking the number of completed calls
+            and the number of items, ``None`` if ``items`` has no length.
+        priority: Optional[:class:`Priority`]
+            Priority of the requests, unless set by :func:`request_options`.
+
+        Yields
+        ------
+        :class:`BulkResult`
+        """
+        async def call(item: Any) -> Any:
+            with default_options(priority=priority):
+                return await func(item)
+
+        async for result in iter_bulk(call, items, concurrency, progress):
+            yield result
+
+    async def map(self,
+                  func: Callable[[Any], Awaitable[Any]],
+                  items: Iterable[Any],
+                  concurrency: int = 10,
+                  progress: Callable[[int, Optional[int]], Any] = None,
+                  priority: Priority = Priority.BACKGROUND
+                  ) -> List[BulkResult]:
+        """|coro|
+
+        Like :meth:`bulk`, but waits for every call and returns the results
+        in the order of ``items``.
+
+        Parameters
+        ----------
+        func: Callable[[Any], Awaitable[Any]]
+            The coroutine function to call, e.g. :meth:`get_playlist_by_id`.
+        items: Iterable[Any]
+            The items to call ``func`` with.
+        concurrency: Optional[:class:`int`]
+            Maximum number of calls running at once.
+        progress: Optional[Callable[[:class:`int`, Optional[:class:`int`]], Any]]
+            A (sync or async) callable taking the number of completed calls
+            and the number of items.
+        priority: Optional[:class:`Priority`]
+            Priority of the requests, unless set by :func:`request_options`.
+
+        Returns
+        -------
+        List[:class:`BulkResult`]
+        """
+        results = []
+        async for result in self.bulk(
+            func,
+            items,
+            concurrency,
+            progress,
+            priority
+        ):
+            results.append(result)
+
+        results.sort(key=lambda result: result.index)
+        return results
+
     async def get_aes(self,
-                      key_format: AESKeyFormat = AESKeyFormat.HEX
+                      key_format: AESKeyFormat = AESKeyFormat.HEX,
+                      timeout: float = None
                       ) -> AESKeys:
         """|coro|
 
@@ -51,20 +238,27 @@ class APIClient:
         ----------
         key_format: :class:`AESKeyFormat`
             Sets the AES key format, defaults to `AESKeyFormat.HEX`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`AESKeys`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url='/v2/aes',
             params={
                 "keyFormat": key_format.value
-            }
+            },
+            timeout=timeout,
+            parse=AESKeys
         )
-        return AESKeys(data)
 
-    async def get_creator_code(self, name: str) -> CreatorCode:
+    async def get_creator_code(self,
+                               name: str,
+                               timeout: float = None
+                               ) -> CreatorCode:
         """|coro|
 
         Return all information about a specific Creator Code such as owner's
@@ -74,20 +268,27 @@ class APIClient:
         ----------
         name: :class:`str`
             The creator code to get information for.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`CreatorCode`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url='/v2/creatorcode',
             params={
                 "name": name
-            }
+            },
+            timeout=timeout,
+            parse=CreatorCode
         )
-        return CreatorCode(data)
 
-    async def get_map(self, language: str = "en") -> Map:
+    async def get_map(self,
+                      language: str = "en",
+                      timeout: float = None
+                      ) -> Map:
         """|coro|
 
         Returns information about the current Battle Royale map.
@@ -96,20 +297,27 @@ class APIClient:
         ----------
         language: Optional[:class:`str`]
             Sets the output language.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`Map`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url='/v1/map',
             params={
                 "language": language
-            }
+            },
+            timeout=timeout,
+            parse=Map
         )
-        return Map(data)
 
-    async def get_news(self, language: str = "en") -> News:
+    async def get_news(self,
+                       language: str = "en",
+                       timeout: float = None
+                       ) -> News:
         """|coro|
 
         Get the current news posts.
@@ -118,20 +326,27 @@ class APIClient:
         ----------
         language: Optional[:class:`str`]
             Sets the output language.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`News`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url='/v2/news/br',
             params={
                 "language": language
-            }
+            },
+            timeout=timeout,
+            parse=News
         )
-        return News(data)
 
-    async def get_playlists(self, language: str = "en") -> list[Playlist]:
+    async def get_playlists(self,
+                            language: str = "en",
+                            timeout: float = None
+                            ) -> list[Playlist]:
         """|coro|
 
         Get all playlists currently in the game (old in-active playlists
@@ -141,22 +356,27 @@ class APIClient:
         ----------
         language: Optional[:class:`str`]
             Sets the output language.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         list[:class:`Playlist`]:
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url='/v1/playlists',
             params={
                 "language": language
-            }
+            },
+            timeout=timeout,
+            parse=ListOf(Playlist)
         )
-        return [Playlist(raw_playlist) for raw_playlist in data]
 
     async def get_playlist_by_id(self,
                                  playlist_id: str,
-                                 language: str = "en"
+                                 language: str = "en",
+                                 timeout: float = None
                                  ) -> Playlist:
         """|coro|
 
@@ -169,25 +389,30 @@ class APIClient:
             The playlist id to search for.
         language: Optional[:class:`str`]
             Sets the output language.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`Playlist`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v1/playlists/{playlist_id}',
             params={
                 "language": language
-            }
+            },
+            timeout=timeout,
+            parse=Playlist
         )
-        return Playlist(data)
 
     async def get_stats(
         self,
         name: str,
         account_type: AccountType = AccountType.EPIC,
         time_window: StatsTimeWindow = StatsTimeWindow.LIFETIME,
-        image: StatsImage = StatsImage.NONE
+        image: StatsImage = StatsImage.NONE,
+        timeout: float = None
     ) -> Stats:
         """|coro|
 
@@ -205,27 +430,33 @@ class APIClient:
         image: Optional[:class:`StatsImage`]
             Which input to create the image for, if not provided an image
             won't be generated.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`Stats`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v2/stats/br/v2',
             params={
                 "name": name,
                 "accountType": account_type.value,
                 "timeWindow": time_window.value,
                 "image": image.value
-            }
+            },
+            timeout=timeout,
+            priority=Priority.INTERACTIVE,
+            parse=Stats
         )
-        return Stats(data)
 
     async def get_stats_by_id(
         self,
         account_id: str,
         time_window: StatsTimeWindow = StatsTimeWindow.LIFETIME,
-        image: StatsImage = StatsImage.NONE
+        image: StatsImage = StatsImage.NONE,
+        timeout: float = None
     ) -> Stats:
         """|coro|
 
@@ -240,23 +471,29 @@ class APIClient:
         image: Optional[:class:`StatsImage`]
             Which input to create the image for, if not provided an image
             won't be generated.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`Stats`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v2/stats/br/v2/{account_id}',
             params={
                 "timeWindow": time_window.value,
                 "image": image.value
-            }
+            },
+            timeout=timeout,
+            priority=Priority.INTERACTIVE,
+            parse=Stats
         )
-        return Stats(data)
 
     async def get_banners(self,
                           language: str = "en",
-                          flags: list[ResponseFlags] = [ResponseFlags.NONE]
+                          flags: list[ResponseFlags] = [ResponseFlags.NONE],
+                          timeout: float = None
                           ) -> list[Banner]:
         """|coro|
 
@@ -268,22 +505,27 @@ class APIClient:
             Sets the output language.
         flags: :class:`list`[:class:`ResponseFlags`]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         list[:class:`Banners`]:
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v1/banners',
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            parse=ListOf(Banner)
         )
-        return [Banner(raw_banner) for raw_banner in data]
 
     async def get_banner_colors(self,
-                                language: str = "en"
+                                language: str = "en",
+                                timeout: float = None
                                 ) -> list[BannerColor]:
         """|coro|
 
@@ -293,22 +535,27 @@ class APIClient:
         ----------
         language: Optional[:class:`str`]
             Sets the output language.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         list[:class:`BannerColor`]:
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v1/banners/colors',
             params={
                 "language": language
-            }
+            },
+            timeout=timeout,
+            parse=ListOf(BannerColor)
         )
-        return [BannerColor(raw_colour) for raw_colour in data]
 
     async def get_shop(self,
                        language: str = "en",
-                       flags: list[ResponseFlags] = [ResponseFlags.NONE]
+                       flags: list[ResponseFlags] = [ResponseFlags.NONE],
+                       timeout: float = None
                        ) -> Shop:
         """|coro|
 
@@ -320,16 +567,20 @@ class APIClient:
             Sets the output language.
         flags: :class:`list`[:class:`ResponseFlags`]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
         :class:`Shop`
         """
-        data = await self.http.api_request(
+        return await self.http.api_request(
             url=f'/v2/shop',
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
-        )
-        return Shop(data)
\ No newline at end of file
+            },
+            timeout=timeout,
+            parse=Shop
+        )
\ No newline at end of file
@@ -0,0 +1,123 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional
+)
+
+import asyncio
+import inspect
+
+
+class BulkResult:
+    """Represents the outcome of one call made by :meth:`APIClient.bulk`
+    or :meth:`APIClient.map`.
+
+    Attributes
+    ----------
+    index: :class:`int`
+        Position of the item in the items given.
+    item: Any
+        The item the call was made with.
+    result: Any
+        What the call returned, ``None`` if it failed.
+    error: Optional[:class:`Exception`]
+        What the call raised, ``None`` if it succeeded.
+    """
+
+    __slots__ = ('index', 'item', 'result', 'error')
+
+    def __init__(self,
+                 index: int,
+                 item: Any,
+                 result: Any = None,
+                 error: Optional[Exception] = None
+                 ) -> None:
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f'<BulkResult index={self.index} item={self.item!r} '
+            f'ok={self.ok}>'
+        )
+
+    @property
+    def ok(self) -> bool:
+        """:class:`bool`: Whether the call succeeded."""
+        return self.error is None
+
+    def get(self) -> Any:
+        """Returns the result of the call, raising its error if it failed."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+_DONE = object()
+
+
+async def iter_bulk(func: Callable[[Any], Awaitable[Any]],
+                    items: Iterable[Any],
+                    concurrency: int = 10,
+                    progress: Callable[[int, Optional[int]], Any] = None
+                    ) -> AsyncIterator[BulkResult]:
+    """Calls ``func`` with every item, at most ``concurrency`` at once, and
+    yields a :class:`BulkResult` for each call as it completes.
+
+    Items are taken from ``items`` as calls finish, so generators aren't
+    consumed up front.
+    """
+    try:
+        total = len(items)
+    except TypeError:
+        total = None
+
+    iterator = enumerate(items)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            # Workers share the iterator, taking an item never awaits.
+            for index, item in iterator:
+                try:
+                    result = BulkResult(index, item, result=await func(item))
+                except Exception as exc:
+                    result = BulkResult(index, item, error=exc)
+                queue.put_nowait(result)
+        finally:
+            queue.put_nowait(_DONE)
+
+    workers = [
+        asyncio.ensure_future(worker())
+        for _ in range(max(min(concurrency, total or concurrency), 1))
+    ]
+
+    running = len(workers)
+    done = 0
+    try:
+        while running:
+            result = await queue.get()
+            if result is _DONE:
+                running -= 1
+                continue
+
+            done += 1
+            if progress is not None:
+                called = progress(done, total)
+                if inspect.isawaitable(called):
+                    await called
+
+            yield result
+    finally:
+        for task in workers:
+            task.cancel()
+
+    # Errors raised by the items iterator itself, rather than by a call.
+    for task in workers:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
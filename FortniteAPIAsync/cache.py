@@ -0,0 +1,398 @@
+from .shop import Shop
+
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple
+)
+
+import datetime
+import math
+import random
+import time
+
+if TYPE_CHECKING:
+    from .storage import Storage
+
+
+class CachePolicy:
+    """Controls how responses of an endpoint are cached by
+    :class:`ResponseCache`.
+
+    Attributes
+    ----------
+    ttl: :class:`float`
+        Seconds a response is returned straight from the cache. Once it
+        runs out the response is revalidated with the API if it was sent
+        with an ``ETag`` or ``Last-Modified`` header, fetched again
+        otherwise. ``0`` revalidates every time.
+    max_entries: Optional[:class:`int`]
+        Maximum number of responses of the endpoint kept, ``None`` only
+        applies the cache's own limit.
+    expires: Optional[Callable[[Any], Optional[:class:`datetime.datetime`]]]
+        Takes a parsed response and returns when it goes stale, used
+        instead of ``ttl`` unless it returns ``None``.
+    stale_while_revalidate: :class:`float`
+        Seconds after going stale during which the response is still
+        returned straight away while it's refreshed in the background.
+        Callers then get the previous response once after each change,
+        ``0`` disables it and is what every default policy uses.
+    early_refresh: :class:`float`
+        How eagerly responses are refreshed in the background before they
+        go stale, the more so the closer they are to going stale and the
+        longer they took to fetch. Spreads out the refreshes of clients
+        sharing a response instead of all missing it at once. ``0``
+        disables it.
+    """
+
+    def __init__(self,
+                 ttl: float = 0.0,
+                 max_entries: int = None,
+                 expires: Callable[[Any], Optional[datetime.datetime]] = None,
+                 stale_while_revalidate: float = 0.0,
+                 early_refresh: float = 1.0
+                 ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.expires = expires
+        self.stale_while_revalidate = stale_while_revalidate
+        self.early_refresh = early_refresh
+
+    def __repr__(self) -> str:
+        return f'<CachePolicy ttl={self.ttl} max_entries={self.max_entries}>'
+
+    def get_expires(self, value: Any) -> float:
+        if self.expires is not None:
+            expires = self.expires(value)
+            if expires is not None:
+                return expires.timestamp()
+        return time.time() + self.ttl
+
+
+def _shop_expires(value: Any) -> Optional[datetime.datetime]:
+    if isinstance(value, Shop):
+        return value.next_rotation
+
+
+# Data that changes a few times a day at most, searches are capped so they
+# don't evict everything else. The shop is kept until the next rotation,
+# then checked every few seconds until the API has rotated too, an
+# outdated shop is never returned. None of them serve stale responses.
+TTL_CACHE_POLICIES = {
+    '/v1/banners': CachePolicy(ttl=3600.0),
+    '/v1/map': CachePolicy(ttl=300.0),
+    '/v1/playlists': CachePolicy(ttl=300.0),
+    '/v2/aes': CachePolicy(ttl=300.0),
+    '/v2/cosmetics': CachePolicy(ttl=300.0),
+    '/v2/cosmetics/br/search': CachePolicy(ttl=600.0, max_entries=64),
+    '/v2/shop': CachePolicy(ttl=15.0, expires=_shop_expires)
+}
+
+
+class CacheEntry:
+    """Represents a response kept by :class:`ResponseCache`.
+
+    Attributes
+    ----------
+    url: :class:`str`
+        The endpoint the response is from.
+    value: Any
+        The parsed response.
+    etag: Optional[:class:`str`]
+        The ``ETag`` the response was sent with.
+    last_modified: Optional[:class:`str`]
+        The ``Last-Modified`` date the response was sent with.
+    expires: :class:`float`
+        UNIX timestamp after which the response is revalidated.
+    delta: :class:`float`
+        Seconds it took to fetch the response.
+    hash: Optional[:class:`str`]
+        Hash of the response content, for responses that have one.
+    size: :class:`int`
+        Size in bytes of the decoded response body.
+    """
+
+    __slots__ = (
+        'url',
+        'value',
+        'etag',
+        'last_modified',
+        'expires',
+        'delta',
+        'hash',
+        'size',
+        'prefix'
+    )
+
+    def __init__(self,
+                 url: str,
+                 value: Any,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[str] = None,
+                 expires: float = 0.0,
+                 delta: float = 0.0,
+                 hash: Optional[str] = None,
+                 size: int = 0,
+                 prefix: Optional[str] = None
+                 ) -> None:
+        self.url = url
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.delta = delta
+        self.hash = hash
+        self.size = size
+        self.prefix = prefix
+
+    def __repr__(self) -> str:
+        return f'<CacheEntry url={self.url!r} fresh={self.fresh}>'
+
+    @property
+    def fresh(self) -> bool:
+        """:class:`bool`: Whether the response can be returned without
+        asking the API."""
+        return time.time() < self.expires
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Keeps parsed responses of GET requests, keyed by URL and parameters.
+
+    Responses are returned straight from the cache for as long as the
+    :class:`CachePolicy` of their endpoint allows. After that, responses
+    sent with an ``ETag`` or ``Last-Modified`` header are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and a ``304 Not Modified``
+    keeps the cached response without downloading or decoding anything.
+
+    By default the API is always asked, responses are only kept to be
+    revalidated or to compare the content hash of the next one with. Pass
+    ``policies=TTL_CACHE_POLICIES`` to return the map, playlists, banners,
+    AES keys, cosmetics and shop straight from the cache for a while.
+
+    The same object is returned each time, it shouldn't be modified. Use
+    ``request_options(cache=False)`` to bypass the cache.
+
+    Attributes
+    ----------
+    max_entries: :class:`int`
+        Maximum number of responses kept, the least recently used ones are
+        dropped first. ``0`` disables the cache.
+    max_bytes: Optional[:class:`int`]
+        Maximum total size of the responses kept, measured by their
+        decoded bodies. Larger responses aren't kept. ``None`` for no
+        limit.
+    policies: :class:`dict`[:class:`str`, :class:`CachePolicy`]
+        Policies keyed by the path prefix they apply to, e.g. ``'/v1/map'``.
+        The longest matching prefix is used.
+    default_policy: :class:`CachePolicy`
+        Policy of endpoints without one, responses are only revalidated.
+    storage: Optional[:class:`Storage`]
+        Where response bodies are also kept, so they're available after a
+        restart and to other processes. Responses not in memory are looked
+        up there before asking the API.
+    hits: :class:`int`
+        Number of responses returned straight from the cache, including
+        stale ones.
+    stale: :class:`int`
+        Number of stale responses returned while they were refreshed.
+    refreshes: :class:`int`
+        Number of background refreshes started.
+    misses: :class:`int`
+        Number of requests sent to the API, including revalidations.
+    revalidated: :class:`int`
+        Number of responses served after a ``304 Not Modified``.
+    unchanged: :class:`int`
+        Number of responses whose content hash matched the cached one, the
+        cached object was returned instead of building a new one.
+    stored: :class:`int`
+        Number of responses stored.
+    """
+
+    def __init__(self,
+                 max_entries: int = 128,
+                 policies: Mapping[str, CachePolicy] = None,
+                 default_policy: CachePolicy = None,
+                 storage: 'Storage' = None,
+                 max_bytes: Optional[int] = 64 * 1024 * 1024
+                 ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policies: Dict[str, CachePolicy] = dict(policies or {})
+        self.default_policy = default_policy or CachePolicy()
+        self.storage = storage
+
+        self.hits = 0
+        self.stale = 0
+        self.refreshes = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.unchanged = 0
+        self.stored = 0
+
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        # Keys of each policy with a size limit, least recently used first.
+        self._segments: Dict[str, 'OrderedDict[Hashable, None]'] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """:class:`int`: Total size in bytes of the responses kept."""
+        return self._bytes
+
+    def get_prefix(self, url: str) -> Optional[str]:
+        matches = [prefix for prefix in self.policies if url.startswith(prefix)]
+        if matches:
+            return max(matches, key=len)
+
+    def get_policy(self, url: str) -> CachePolicy:
+        prefix = self.get_prefix(url)
+        if prefix is not None:
+            return self.policies[prefix]
+        return self.default_policy
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._touch(key, entry)
+        return entry
+
+    def check(self, entry: CacheEntry) -> Tuple[bool, bool]:
+        # Whether the entry can be returned and whether it should be
+        # refreshed in the background.
+        policy = self.get_policy(entry.url)
+        now = time.time()
+        if now >= entry.expires:
+            stale = now < entry.expires + policy.stale_while_revalidate
+            self.stale += stale
+            return stale, stale
+
+        # Probabilistic early expiration (XFetch): the chance grows as
+        # expiry nears, scaled by how long the response takes to fetch.
+        early = policy.early_refresh * entry.delta * -math.log(
+            1.0 - random.random()
+        )
+        return True, now + early >= entry.expires
+
+    def set(self,
+            key: Hashable,
+            url: str,
+            value: Any,
+            headers: Mapping[str, str],
+            delta: float = 0.0,
+            hash: Optional[str] = None,
+            size: int = 0
+            ) -> Optional[CacheEntry]:
+        policy = self.get_policy(url)
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if self.max_entries <= 0 or policy.max_entries == 0:
+            return None
+        if self.max_bytes is not None and size > self.max_bytes:
+            return None
+        # Without validators, a TTL or a content hash to compare the next
+        # response with, the response could never be reused.
+        reusable = policy.ttl > 0 or policy.expires is not None
+        if (etag is None and last_modified is None and hash is None
+                and not reusable):
+            return None
+
+        entry = CacheEntry(
+            url,
+            value,
+            etag,
+            last_modified,
+            policy.get_expires(value),
+            delta,
+            hash,
+            size
+        )
+        self.stored += 1
+        return self._insert(key, entry)
+
+    def restore(self, key: Hashable, entry: CacheEntry) -> CacheEntry:
+        # Puts back an entry read from storage, keeping its expiry.
+        return self._insert(key, entry)
+
+    def refresh(self,
+                entry: CacheEntry,
+                headers: Mapping[str, str],
+                delta: float = 0.0
+                ) -> None:
+        # The API confirmed the response is still current.
+        entry.delta = delta
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        entry.expires = self.get_policy(entry.url).get_expires(entry.value)
+
+    def discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        if entry.prefix is not None:
+            self._segments[entry.prefix].pop(key, None)
+
+    def invalidate(self, prefix: str = '') -> int:
+        """Drops the responses of every endpoint starting with ``prefix``,
+        all of them by default.
+
+        Returns
+        -------
+        :class:`int`
+            Number of responses dropped.
+        """
+        keys = [
+            key for key, entry in self._entries.items()
+            if entry.url.startswith(prefix)
+        ]
+        for key in keys:
+            self.discard(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._segments.clear()
+        self._bytes = 0
+
+    def _insert(self, key: Hashable, entry: CacheEntry) -> CacheEntry:
+        policy = self.get_policy(entry.url)
+        if policy.max_entries is not None:
+            entry.prefix = self.get_prefix(entry.url)
+
+        self.discard(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._touch(key, entry)
+
+        segment = self._segments.get(entry.prefix)
+        while segment is not None and len(segment) > policy.max_entries:
+            self.discard(next(iter(segment)))
+        while (len(self._entries) > self.max_entries
+               or (self.max_bytes is not None
+                   and self._bytes > self.max_bytes)):
+            self.discard(next(iter(self._entries)))
+        return entry
+
+    def _touch(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries.move_to_end(key)
+        if entry.prefix is not None:
+            segment = self._segments.setdefault(entry.prefix, OrderedDict())
+            segment[key] = None
+            segment.move_to_end(key)
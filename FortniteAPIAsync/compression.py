@@ -0,0 +1,141 @@
+from .exceptions import UnknownHTTPException
+
+from typing import Callable, Dict, Optional, Tuple
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+if zstd is None:
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+else:
+    zstandard = None
+
+
+class TransferStats:
+    """Represents how many bytes were received for an endpoint family.
+
+    Attributes
+    ----------
+    responses: :class:`int`
+        Number of responses received.
+    wire_bytes: :class:`int`
+        Bytes received over the network, before decompression.
+    decoded_bytes: :class:`int`
+        Bytes after decompression.
+    encodings: :class:`dict`[:class:`str`, :class:`int`]
+        Number of responses received per content encoding, ``identity``
+        for uncompressed responses.
+    """
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.encodings: Dict[str, int] = {}
+
+    @property
+    def saved_bytes(self) -> int:
+        """:class:`int`: Bytes saved by compression."""
+        return self.decoded_bytes - self.wire_bytes
+
+    @property
+    def ratio(self) -> float:
+        """:class:`float`: Wire bytes divided by decoded bytes."""
+        return self.wire_bytes / self.decoded_bytes if self.decoded_bytes else 1.0
+
+    def add(self, encoding: str, wire_bytes: int, decoded_bytes: int) -> None:
+        self.responses += 1
+        self.wire_bytes += wire_bytes
+        self.decoded_bytes += decoded_bytes
+        self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+
+class _Decompressor:
+    def __init__(self,
+                 decompress: Callable[[bytes], bytes],
+                 flush: Callable[[], bytes] = None
+                 ) -> None:
+        self.decompress = decompress
+        self.flush = flush or (lambda: b'')
+
+
+def _zlib(wbits: int) -> _Decompressor:
+    obj = zlib.decompressobj(wbits)
+    return _Decompressor(obj.decompress, obj.flush)
+
+
+def _brotli() -> _Decompressor:
+    obj = brotli.Decompressor()
+    return _Decompressor(getattr(obj, 'process', None) or obj.decompress)
+
+
+def _zstd() -> _Decompressor:
+    if zstd is not None:
+        return _Decompressor(zstd.ZstdDecompressor().decompress)
+    return _Decompressor(
+        zstandard.ZstdDecompressor().decompressobj().decompress
+    )
+
+
+_DECOMPRESSORS: Dict[str, Callable[[], _Decompressor]] = {
+    'gzip': lambda: _zlib(16 + zlib.MAX_WBITS),
+    'deflate': lambda: _zlib(zlib.MAX_WBITS),
+}
+if brotli is not None:
+    _DECOMPRESSORS['br'] = _brotli
+if zstd is not None or zstandard is not None:
+    _DECOMPRESSORS['zstd'] = _zstd
+
+
+def accept_encoding() -> str:
+    # Best compression first, only encodings that can be decoded here.
+    preferred = ('zstd', 'br', 'gzip', 'deflate')
+    return ', '.join(name for name in preferred if name in _DECOMPRESSORS)
+
+
+def get_decompressor(encoding: Optional[str]) -> Optional[_Decompressor]:
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding == 'identity':
+        return None
+
+    try:
+        return _DECOMPRESSORS[encoding]()
+    except KeyError:
+        raise UnknownHTTPException(
+            f'Unsupported content encoding: {encoding}'
+        ) from None
+
+
+def compress(data: bytes) -> Tuple[str, bytes]:
+    # Used for bodies kept on disk, returns the encoding used so they can
+    # be read back with get_decompressor.
+    if zstd is not None:
+        return 'zstd', zstd.compress(data)
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor().compress(data)
+    return 'deflate', zlib.compress(data)
+
+
+def decompress(encoding: Optional[str], data: bytes) -> bytes:
+    decompressor = get_decompressor(encoding)
+    if decompressor is None:
+        return data
+    return decompressor.decompress(data) + decompressor.flush()
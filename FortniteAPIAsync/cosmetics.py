@@ -1,10 +1,11 @@
 from .enums import *
 from .exceptions import *
-from .utils import combine_flags
+from .utils import ListOf, combine_flags
+from .streaming import iter_array_items
 
 import datetime
 
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Union
 
 class BRCosmetic:
     """Represents a Fortnite cosmetic.
@@ -763,6 +764,24 @@ class NewCosmetics:
             type=BeanCosmetic
         )
 
+    @staticmethod
+    def content_hash(data: dict) -> Optional[str]:
+        # Covers every cosmetic type, not only Battle Royale.
+        return data.get('hashes', {}).get('all')
+
+
+# Keys of the /v2/cosmetics response mapped to their attribute name on
+# AllCosmetics and the model they're built into.
+_COSMETIC_TYPES = {
+    'br': ('br', BRCosmetic),
+    'tracks': ('tracks', TrackCosmetic),
+    'instruments': ('instruments', InstrumentCosmetic),
+    'cars': ('cars', CarCosmetic),
+    'lego': ('lego', LegoCosmetic),
+    'legoKits': ('lego_kits', LegoKitCosmetic),
+    'beans': ('beans', BeanCosmetic)
+}
+
 
 class Cosmetics:
     def __init__(self, client: 'APIClient') -> None:
@@ -770,6 +789,7 @@ class Cosmetics:
 
     async def get_cosmetic(self,
                            flags: list[ResponseFlags] = [ResponseFlags.NONE],
+                           timeout: float = None,
                            **params: dict
                            ) -> BRCosmetic:
         """|coro|
@@ -851,6 +871,9 @@ class Cosmetics:
             Sets for how long its unseen.
         lastAppearance: Optional[:class:`int`]
             Sets the last appearance date.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Raises
         ------
@@ -871,14 +894,17 @@ class Cosmetics:
             )
 
         params["responseFlags"] = int(combine_flags(flags))
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/br/search",
-            params=params
+            params=params,
+            timeout=timeout,
+            priority=Priority.INTERACTIVE,
+            parse=BRCosmetic
         )
-        return BRCosmetic(data)
 
     async def get_cosmetics(self,
                             flags: list[ResponseFlags] = [ResponseFlags.NONE],
+                            timeout: float = None,
                             **params: dict
                             ) -> list[BRCosmetic]:
         """|coro|
@@ -960,6 +986,9 @@ class Cosmetics:
             Sets for how long its unseen.
         lastAppearance: Optional[:class:`int`]
             Sets the last appearance date.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Raises
         ------
@@ -981,18 +1010,20 @@ class Cosmetics:
             )
 
         params["responseFlags"] = int(combine_flags(flags))
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/br/search/all",
-            params=params
+            params=params,
+            timeout=timeout,
+            priority=Priority.INTERACTIVE,
+            parse=ListOf(BRCosmetic)
         )
 
-        return [BRCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def search_cosmetic_ids(
         self,
         fortnite_ids: str = None,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[BRCosmetic]:
         """|coro|
 
@@ -1006,6 +1037,9 @@ class Cosmetics:
             Sets the cosmetic id (can be multiple).
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Raises
         ------
@@ -1026,20 +1060,21 @@ class Cosmetics:
                 'No search parameters provided. At least 1 is required.'
             )
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/br/search/ids",
             params={
                 "language": language,
                 "id": fortnite_ids,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            parse=ListOf(BRCosmetic)
         )
 
-        return [BRCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_br_cosmetics(self,
                                    language: str = 'en',
-                                   flags: list[ResponseFlags] = [ResponseFlags.NONE]
+                                   flags: list[ResponseFlags] = [ResponseFlags.NONE],
+                                   timeout: float = None
                                    ) -> List[BRCosmetic]:
         """|coro|
 
@@ -1051,6 +1086,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1059,20 +1097,22 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/br/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(BRCosmetic)
         )
 
-        return [BRCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_new_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> NewCosmetics:
         """|coro|
 
@@ -1084,6 +1124,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1092,21 +1135,22 @@ class Cosmetics:
             new items.
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/new",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            parse=NewCosmetics
         )
 
-        return NewCosmetics(data)
-
     async def get_cosmetic_from_id(
             self,
             fortnite_id: str = None,
             language: str = 'en',
             flags: list[ResponseFlags] = [ResponseFlags.NONE],
+            timeout: float = None
     ) -> BRCosmetic:
         """|coro|
 
@@ -1120,6 +1164,9 @@ class Cosmetics:
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
         fortnite_id: Optional[:class:`str`]
             Sets the cosmetic id (can be multiple).
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Raises
         ------
@@ -1138,20 +1185,22 @@ class Cosmetics:
         if not fortnite_id:
             raise InvalidParameters('No search parameters provided. At least 1 is required.')
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url=f"/v2/cosmetics/br/{fortnite_id}",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.INTERACTIVE,
+            parse=BRCosmetic
         )
 
-        return BRCosmetic(data)
-
     async def get_all_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> AllCosmetics:
         """|coro|
 
@@ -1163,6 +1212,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1170,20 +1222,124 @@ class Cosmetics:
             AllCosmetics object containing all types cosmetics.
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
+            url="/v2/cosmetics/",
+            params={
+                "language": language,
+                "responseFlags": combine_flags(flags)
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=AllCosmetics
+        )
+
+    async def iter_all(
+        self,
+        language: str = 'en',
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        types: list[str] = None,
+        chunk_size: int = 65536,
+        timeout: float = None
+    ) -> AsyncIterator[Union[BRCosmetic, TrackCosmetic, InstrumentCosmetic,
+                             CarCosmetic, LegoCosmetic, LegoKitCosmetic,
+                             BeanCosmetic]]:
+        """Iterates over all cosmetics while the response is still being
+        downloaded, yielding each cosmetic as soon as it's received instead
+        of building them all at once like :meth:`get_all_cosmetics`.
+
+        .. code-block:: python3
+
+            async for cosmetic in client.cosmetics.iter_all(types=['br']):
+                print(cosmetic.name)
+
+        Parameters
+        ----------
+        language: Optional[:class:`str`]
+            Sets the output language.
+        flags: Optional[:class:`list`[:class:`ResponseFlags`]]
+            Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        types: Optional[:class:`list`[:class:`str`]]
+            Only yield these cosmetic types, named like the attributes of
+            :class:`AllCosmetics` (e.g. `br`, `tracks`, `lego_kits`).
+            Defaults to all types.
+        chunk_size: Optional[:class:`int`]
+            Maximum size in bytes of each chunk read from the response.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds to wait for the response to start,
+            including retries and waiting on rate limits. Defaults to the
+            endpoint's timeout.
+
+        Yields
+        ------
+        Union[:class:`BRCosmetic`, :class:`TrackCosmetic`, :class:`InstrumentCosmetic`, :class:`CarCosmetic`, :class:`LegoCosmetic`, :class:`LegoKitCosmetic`, :class:`BeanCosmetic`]
+        """
+
+        chunks = self.client.http.iter_chunks(
             url="/v2/cosmetics/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            chunk_size=chunk_size,
+            timeout=timeout,
+            priority=Priority.BACKGROUND
         )
 
-        return AllCosmetics(data)
+        async for key, raw in iter_array_items(chunks, depth=3):
+            if key not in _COSMETIC_TYPES:
+                continue
+
+            name, model = _COSMETIC_TYPES[key]
+            if types is None or name in types:
+                yield model(self.client.http.loads(raw))
+
+    async def iter_all_br(
+        self,
+        language: str = 'en',
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        chunk_size: int = 65536,
+        timeout: float = None
+    ) -> AsyncIterator[BRCosmetic]:
+        """Iterates over all Battle Royale cosmetics while the response is
+        still being downloaded, like :meth:`iter_all`.
+
+        Parameters
+        ----------
+        language: Optional[:class:`str`]
+            Sets the output language.
+        flags: Optional[:class:`list`[:class:`ResponseFlags`]]
+            Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        chunk_size: Optional[:class:`int`]
+            Maximum size in bytes of each chunk read from the response.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds to wait for the response to start,
+            including retries and waiting on rate limits. Defaults to the
+            endpoint's timeout.
+
+        Yields
+        ------
+        :class:`BRCosmetic`
+        """
+
+        chunks = self.client.http.iter_chunks(
+            url="/v2/cosmetics/br/",
+            params={
+                "language": language,
+                "responseFlags": combine_flags(flags)
+            },
+            chunk_size=chunk_size,
+            timeout=timeout,
+            priority=Priority.BACKGROUND
+        )
+
+        async for _, raw in iter_array_items(chunks, depth=2):
+            yield BRCosmetic(self.client.http.loads(raw))
 
     async def get_all_track_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> List[TrackCosmetic]:
         """|coro|
 
@@ -1195,6 +1351,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1204,20 +1363,22 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/tracks/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(TrackCosmetic)
         )
 
-        return [TrackCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_instrument_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[InstrumentCosmetic]:
         """|coro|
 
@@ -1229,6 +1390,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1238,20 +1402,22 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/instruments/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(InstrumentCosmetic)
         )
 
-        return [InstrumentCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_car_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[CarCosmetic]:
         """|coro|
 
@@ -1263,6 +1429,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1272,20 +1441,22 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/cars/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(CarCosmetic)
         )
 
-        return [CarCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_lego_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[LegoCosmetic]:
         """|coro|
 
@@ -1297,6 +1468,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1305,20 +1479,22 @@ class Cosmetics:
             of the cosmetics.
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/lego/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(LegoCosmetic)
         )
 
-        return [LegoCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_lego_kit_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[LegoKitCosmetic]:
         """|coro|
 
@@ -1330,6 +1506,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1339,20 +1518,22 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/lego/kits/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(LegoKitCosmetic)
         )
 
-        return [LegoKitCosmetic(cosmetic_data) for cosmetic_data in data]
-
     async def get_all_bean_cosmetics(
         self,
         language: str = 'en',
-        flags: list[ResponseFlags] = [ResponseFlags.NONE]
+        flags: list[ResponseFlags] = [ResponseFlags.NONE],
+        timeout: float = None
     ) -> list[BeanCosmetic]:
         """|coro|
 
@@ -1364,6 +1545,9 @@ class Cosmetics:
             Sets the output language.
         flags: Optional[:class:`list`[:class:`ResponseFlags`]]
             Opt-in for certain properties, defaults to `[ResponseFlags.NONE]`.
+        timeout: Optional[:class:`float`]
+            Maximum time in seconds the call may take, including retries and
+            waiting on rate limits. Defaults to the endpoint's timeout.
 
         Returns
         -------
@@ -1373,12 +1557,13 @@ class Cosmetics:
 
         """
 
-        data = await self.client.http.api_request(
+        return await self.client.http.api_request(
             url="/v2/cosmetics/beans/",
             params={
                 "language": language,
                 "responseFlags": combine_flags(flags)
-            }
+            },
+            timeout=timeout,
+            priority=Priority.BACKGROUND,
+            parse=ListOf(BeanCosmetic)
         )
-
-        return [BeanCosmetic(cosmetic_data) for cosmetic_data in data]
@@ -1,4 +1,4 @@
-from enum import Enum, IntFlag
+from enum import Enum, IntEnum, IntFlag
 
 
 class AccountType(Enum):
@@ -30,3 +30,9 @@ class ResponseFlags(IntFlag):
     INCLUDE_PATHS           = 1 << 0
     INCLUDE_GAMEPLAY_TAGS   = 1 << 1
     INCLUDE_SHOP_HISTORY    = 1 << 2
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    NORMAL      = 1
+    BACKGROUND  = 2
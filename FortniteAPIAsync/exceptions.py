@@ -15,5 +15,24 @@ class Private(FortniteAPIException):
 
 
 class UnknownHTTPException(FortniteAPIException):
+    def __init__(self, message: str = None, status: int = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimited(FortniteAPIException):
+    def __init__(self, message: str = None, retry_after: float = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpen(FortniteAPIException):
     pass
 
+
+class DeadlineExceeded(FortniteAPIException):
+    pass
+
+
+class Overloaded(FortniteAPIException):
+    pass
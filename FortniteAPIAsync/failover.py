@@ -0,0 +1,180 @@
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    Iterable,
+    List,
+    Optional,
+    Union
+)
+
+import asyncio
+import time
+
+
+class Mirror:
+    """Represents a base URL in a :class:`MirrorPool`.
+
+    Attributes
+    ----------
+    url: :class:`str`
+        The base URL, e.g. ``'https://fortnite-api.com'``.
+    healthy: :class:`bool`
+        Whether requests are currently sent to this mirror.
+    latency: Optional[:class:`float`]
+        Smoothed probe latency in seconds, ``None`` until it's been probed.
+    requests: :class:`int`
+        Number of requests sent to this mirror.
+    failures: :class:`int`
+        Number of requests and probes that failed.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip('/')
+        self.healthy = True
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+
+        self._consecutive_failures = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'<Mirror url={self.url!r} healthy={self.healthy} '
+            f'latency={self.latency}>'
+        )
+
+
+class MirrorPool:
+    """Sends each request to the fastest healthy of several base URLs.
+
+    Mirrors are probed in the background to measure their latency and to
+    bring back mirrors that failed. Until the first probes finish, mirrors
+    are used in the order given.
+
+    Attributes
+    ----------
+    mirrors: :class:`list`[:class:`Mirror`]
+        The mirrors, in order of preference.
+    probe_path: :class:`str`
+        Path requested with ``HEAD`` to probe a mirror.
+    probe_interval: :class:`float`
+        How long in seconds between probes.
+    probe_timeout: :class:`float`
+        How long in seconds a probe may take before the mirror is
+        considered down.
+    failure_threshold: :class:`int`
+        Consecutive failed requests after which a mirror is marked
+        unhealthy until a probe succeeds.
+    smoothing: :class:`float`
+        Weight given to the newest probe in the latency average.
+    """
+
+    def __init__(self,
+                 bases: Iterable[Union[str, Mirror]],
+                 probe_path: str = '/v2/aes',
+                 probe_interval: float = 30.0,
+                 probe_timeout: float = 5.0,
+                 failure_threshold: int = 3,
+                 smoothing: float = 0.3
+                 ) -> None:
+        self.mirrors: List[Mirror] = [
+            base if isinstance(base, Mirror) else Mirror(base)
+            for base in bases
+        ]
+        if not self.mirrors:
+            raise ValueError('MirrorPool requires at least one base URL.')
+
+        self.probe_path = probe_path
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.failure_threshold = failure_threshold
+        self.smoothing = smoothing
+
+        self._task: Optional[asyncio.Task] = None
+
+    def select(self, exclude: Collection[str] = ()) -> Mirror:
+        """Returns the fastest healthy mirror whose URL isn't in
+        ``exclude``, falling back to unhealthy or excluded mirrors if
+        there's no other choice."""
+        def rank(item: tuple) -> tuple:
+            index, mirror = item
+            return (
+                mirror.url in exclude,
+                not mirror.healthy,
+                # Unprobed mirrors keep their configured order.
+                mirror.latency if mirror.latency is not None else 0.0,
+                index
+            )
+
+        return min(enumerate(self.mirrors), key=rank)[1]
+
+    def has_untried(self, tried: Collection[str]) -> bool:
+        return any(
+            mirror.healthy and mirror.url not in tried
+            for mirror in self.mirrors
+        )
+
+    def record_success(self, mirror: Mirror) -> None:
+        mirror._consecutive_failures = 0
+
+    def record_failure(self, mirror: Mirror) -> None:
+        mirror.failures += 1
+        mirror._consecutive_failures += 1
+        if mirror._consecutive_failures >= self.failure_threshold:
+            mirror.healthy = False
+
+    def start(self, probe: Callable[[str], Awaitable[bool]]) -> None:
+        """Starts probing mirrors in the background with ``probe``, which
+        requests a URL and returns whether the mirror answered correctly.
+
+        Does nothing if there's a single mirror or probing already runs.
+        """
+        if len(self.mirrors) < 2 or self.probe_interval <= 0:
+            return
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run(probe))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, probe: Callable[[str], Awaitable[bool]]) -> None:
+        while True:
+            await asyncio.gather(*(
+                self._probe(mirror, probe) for mirror in self.mirrors
+            ))
+            await asyncio.sleep(self.probe_interval)
+
+    async def _probe(self,
+                     mirror: Mirror,
+                     probe: Callable[[str], Awaitable[bool]]
+                     ) -> None:
+        started = time.monotonic()
+        try:
+            healthy = await asyncio.wait_for(
+                probe(f'{mirror.url}{self.probe_path}'),
+                self.probe_timeout
+            )
+        except asyncio.TimeoutError:
+            healthy = False
+
+        if not healthy:
+            mirror.failures += 1
+            mirror.healthy = False
+            return
+
+        latency = time.monotonic() - started
+        if mirror.latency is None:
+            mirror.latency = latency
+        else:
+            mirror.latency += self.smoothing * (latency - mirror.latency)
+
+        mirror.healthy = True
+        mirror._consecutive_failures = 0
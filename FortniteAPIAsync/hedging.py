@@ -0,0 +1,75 @@
+from .utils import endpoint_family
+
+from collections import deque
+from typing import Deque, Dict
+
+
+class HedgePolicy:
+    """Represents when a duplicate of a slow GET request is sent.
+
+    If a request hasn't been answered after the chosen percentile of
+    recent latencies for its endpoint family, the same request is sent
+    again and whichever response arrives first is used.
+
+    Attributes
+    ----------
+    percentile: :class:`float`
+        Latency percentile, between 0 and 1, after which a request is
+        hedged.
+    initial_delay: :class:`float`
+        Delay in seconds used until enough latencies have been recorded.
+    min_delay: :class:`float`
+        Lower bound in seconds for the hedging delay.
+    max_ratio: :class:`float`
+        Maximum share of requests that may be hedged, keeping the extra
+        quota used bounded.
+    window: :class:`int`
+        Number of recent latencies kept per endpoint family.
+    min_samples: :class:`int`
+        Latencies needed before the percentile is used.
+    requests: :class:`int`
+        Number of requests eligible for hedging.
+    hedges: :class:`int`
+        Number of hedged requests sent.
+    hedge_wins: :class:`int`
+        Number of times the hedged request answered first.
+    """
+
+    def __init__(self,
+                 percentile: float = 0.95,
+                 initial_delay: float = 1.0,
+                 min_delay: float = 0.05,
+                 max_ratio: float = 0.1,
+                 window: int = 256,
+                 min_samples: int = 20
+                 ) -> None:
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.window = window
+        self.min_samples = min_samples
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, url: str, latency: float) -> None:
+        family = endpoint_family(url)
+        if family not in self._latencies:
+            self._latencies[family] = deque(maxlen=self.window)
+        self._latencies[family].append(latency)
+
+    def get_delay(self, url: str) -> float:
+        latencies = self._latencies.get(endpoint_family(url), ())
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+
+        ordered = sorted(latencies)
+        index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+        return max(ordered[index], self.min_delay)
+
+    def can_hedge(self) -> bool:
+        return self.hedges < self.requests * self.max_ratio
@@ -1,61 +1,1042 @@
 from . import __version__
-from .exceptions import InvalidParameters, NotFound, Private
+from .exceptions import (
+    DeadlineExceeded,
+    FortniteAPIException,
+    InvalidParameters,
+    NotFound,
+    Overloaded,
+    Private,
+    RateLimited,
+    UnknownHTTPException
+)
+from .enums import Priority
+from .cache import CacheEntry, ResponseCache
+from .compression import TransferStats, accept_encoding, get_decompressor
+from .failover import MirrorPool
+from .hedging import HedgePolicy
+from .keys import APIKey, APIKeyPool
+from .options import current_options, default_options, request_options
+from .pool import PoolConfig
+from .ratelimit import RateLimiter, TokenBucket, parse_retry_after
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import RequestScheduler
+from .transport import AiohttpTransport, Transport, TransportResponse
+from .utils import canonical_params, endpoint_family, find_json_loads
 
-from typing import Any, Dict, Union
+from urllib.parse import urlencode
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union
+)
 
 import aiohttp
+import asyncio
+import inspect
 import json
+import os
+import secrets
+import time
+
+
+class _Deadline:
+    def __init__(self, at: float) -> None:
+        self.at = at
+
+    @classmethod
+    def after(cls, timeout: float) -> '_Deadline':
+        return cls(time.monotonic() + timeout)
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class _Conditional:
+    def __init__(self, entry: Optional[CacheEntry]) -> None:
+        self.entry = entry
+        self.headers = entry.validators() if entry is not None else {}
+        self.response_headers: Mapping[str, str] = {}
+        self.body: Optional[bytes] = None
+        self.not_modified = False
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task, deadline: _Deadline) -> None:
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+
+# Full catalog dumps are large, lookups should answer quickly.
+DEFAULT_TIMEOUTS = {
+    '/v2/cosmetics': 60.0,
+    '/v2/cosmetics/br/search': 15.0,
+    '/v2/stats': 15.0
+}
 
 
 class HTTPClient:
     def __init__(self,
-                 base: str = 'https://fortnite-api.com',
+                 base: Union[str, Iterable[str], MirrorPool] = (
+                     'https://fortnite-api.com'
+                 ),
                  headers: dict = None,
-                 session: aiohttp.ClientSession = None
+                 session: aiohttp.ClientSession = None,
+                 pool: PoolConfig = None,
+                 warm_connections: int = 0,
+                 shared_session: bool = False,
+                 rate_limits: Dict[str, TokenBucket] = None,
+                 rate_limit_retries: int = 3,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 loads: Callable[[bytes], Any] = None,
+                 hedge_policy: HedgePolicy = None,
+                 timeout: float = 30.0,
+                 timeouts: Dict[str, float] = None,
+                 transport: Transport = None,
+                 key_pool: APIKeyPool = None,
+                 scheduler: RequestScheduler = None,
+                 cache: ResponseCache = None
                  ) -> None:
-        self.base = base
+        if not isinstance(base, MirrorPool):
+            base = MirrorPool([base] if isinstance(base, str) else base)
+        self.mirrors = base
+        self.loads = loads or find_json_loads()
+
+        self.transport = transport or AiohttpTransport(
+            session=session,
+            pool=pool,
+            shared_session=shared_session
+        )
+        self.warm_connections = warm_connections
+
+        self.key_pool = key_pool
+        self.rate_limiter = RateLimiter(rate_limits)
+        self.rate_limit_retries = rate_limit_retries
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.hedge_policy = hedge_policy
+        self.scheduler = scheduler or RequestScheduler()
+
+        self.timeout = timeout
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+
+        self.cache = cache if cache is not None else ResponseCache()
 
-        self.session = session
+        self._flights: Dict[tuple, _Flight] = {}
+        self.coalesced_requests = 0
+
+        self.transfer_stats: Dict[str, TransferStats] = {}
 
         self.headers = headers or {}
         self.headers.setdefault(
             'User-Agent',
             f'FortniteAPIAsync/{__version__}'
         )
+        self.headers.setdefault('Accept-Encoding', accept_encoding())
+
+    @property
+    def base(self) -> str:
+        return self.mirrors.select().url
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return getattr(self.transport, 'session', None)
 
     async def close(self) -> None:
-        if self.session:
-            await self.session.close()
-            self.session = None
+        # Background refreshes would otherwise reopen the transport.
+        refreshes = [
+            flight.task for flight in self._flights.values()
+            if not flight.waiters
+        ]
+        for task in refreshes:
+            task.cancel()
+        if refreshes:
+            await asyncio.wait(refreshes)
+
+        await self.mirrors.stop()
+        await self.transport.close()
+        if self.cache.storage is not None:
+            await self.cache.storage.close()
 
     async def set_session(self) -> None:
-        self.session = aiohttp.ClientSession(
-            headers=self.headers
-        )
+        await self.transport.open()
+        self.mirrors.start(self._probe)
+
+    async def warm_up(self, connections: int = None) -> None:
+        connections = connections or self.warm_connections
+        if connections > 0:
+            await self.transport.warm_up(self.base, self.headers, connections)
+
+    def get_timeout(self, url: str) -> float:
+        matches = [prefix for prefix in self.timeouts if url.startswith(prefix)]
+        if matches:
+            return self.timeouts[max(matches, key=len)]
+        return self.timeout
 
     async def api_request(self,
+                          url: str,
+                          method: str = 'GET',
+                          params: dict = None,
+                          raw: bool = False,
+                          timeout: float = None,
+                          priority: Priority = None,
+                          parse: Callable[[Any], Any] = None,
+                          **kwargs: Any
+                          ) -> Any:
+        if priority is not None:
+            # Tasks created below, like the coalesced request, inherit it.
+            with default_options(priority=priority):
+                return await self.api_request(
+                    url,
+                    method,
+                    params,
+                    raw,
+                    timeout,
+                    parse=parse,
+                    **kwargs
+                )
+
+        # The deadline covers everything the call waits on: rate limits,
+        # retries and other callers' requests it's coalesced with.
+        deadline = _Deadline.after(timeout or self.get_timeout(url))
+
+        # Identical GETs that are already in flight share one upstream
+        # request, each caller gets the same parsed data.
+        if method != 'GET' or kwargs:
+            data = await self._request(
+                url,
+                method,
+                params,
+                raw,
+                deadline=deadline,
+                **kwargs
+            )
+            return parse(data) if parse is not None else data
+
+        key = (url, canonical_params(params), raw, parse)
+        use_cache = current_options().cache is not False
+        if use_cache:
+            entry = self.cache.get(key)
+            if entry is not None:
+                usable, refresh = self.cache.check(entry)
+                if usable:
+                    self.cache.hits += 1
+                    if refresh:
+                        self._refresh(key, url, params, raw, parse)
+                    return entry.value
+
+        # Callers bypassing the cache don't share a request that may be
+        # answered from storage.
+        flight = self._flights.get((key, use_cache))
+        if flight is None:
+            flight = self._start_flight(
+                key,
+                url,
+                params,
+                raw,
+                parse,
+                _Deadline(deadline.at),
+                use_cache
+            )
+        else:
+            self.coalesced_requests += 1
+            # The shared request keeps going for as long as its most
+            # patient caller is willing to wait.
+            flight.deadline.at = max(flight.deadline.at, deadline.at)
+
+        flight.waiters += 1
+        try:
+            # Waiting doesn't cancel the task when this caller gives up or
+            # is cancelled, other callers may still be waiting on it.
+            await asyncio.wait([flight.task], timeout=deadline.remaining())
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Dropped straight away, callers arriving before the task
+                # has finished cancelling start a new request instead.
+                if self._flights.get((key, use_cache)) is flight:
+                    del self._flights[key, use_cache]
+                flight.task.cancel()
+
+        if not flight.task.done():
+            raise DeadlineExceeded(f'{url} did not answer in time.')
+        return flight.task.result()
+
+    def _start_flight(self,
+                      key: tuple,
                       url: str,
-                      method: str = 'GET',
-                      params: dict = None,
-                      **kwargs: Any
-                      ) -> dict:
-        if not self.session:
-            await self.set_session()
-
-        async with self.session.request(
-            method=method,
-            url=f'{self.base}{url}',
+                      params: dict,
+                      raw: bool,
+                      parse: Optional[Callable[[Any], Any]],
+                      deadline: _Deadline,
+                      use_cache: bool = True
+                      ) -> _Flight:
+        flight = self._flights[key, use_cache] = _Flight(
+            asyncio.ensure_future(self._fetch(
+                key,
+                url,
+                params,
+                raw,
+                parse,
+                deadline,
+                use_cache
+            )),
+            deadline
+        )
+
+        def done(_: asyncio.Task) -> None:
+            # A background refresh may have replaced it already.
+            if self._flights.get((key, use_cache)) is flight:
+                del self._flights[key, use_cache]
+
+        flight.task.add_done_callback(done)
+        return flight
+
+    def _refresh(self,
+                 key: tuple,
+                 url: str,
+                 params: dict,
+                 raw: bool,
+                 parse: Optional[Callable[[Any], Any]],
+                 replace: bool = False
+                 ) -> None:
+        # Fetches a cached response again without anyone waiting on it,
+        # callers keep getting the cached one until it's done. Only one
+        # refresh runs per response.
+        if (key, True) in self._flights and not replace:
+            return
+
+        self.cache.refreshes += 1
+        with request_options(priority=Priority.BACKGROUND):
+            flight = self._start_flight(
+                key,
+                url,
+                params,
+                raw,
+                parse,
+                _Deadline.after(self.get_timeout(url))
+            )
+        # Errors are only kept out of the cache, the stale response stays.
+        flight.task.add_done_callback(
+            lambda task: task.cancelled() or task.exception()
+        )
+
+    async def _fetch(self,
+                     key: tuple,
+                     url: str,
+                     params: dict,
+                     raw: bool,
+                     parse: Optional[Callable[[Any], Any]],
+                     deadline: _Deadline,
+                     use_cache: bool = True
+                     ) -> Any:
+        storage = self.cache.storage if use_cache else None
+        storage_key = f'{url}?{urlencode(key[1])}{"#raw" if raw else ""}'
+
+        entry = self.cache.get(key) if use_cache else None
+        if storage is not None:
+            # Another client may have stored a more recent response.
+            stored = await self._restore(key, storage_key, raw, parse, entry)
+            if stored is not None:
+                entry = stored
+                usable, refresh = self.cache.check(entry)
+                if usable:
+                    self.cache.hits += 1
+                    if refresh:
+                        # Takes over from this flight, which is ending.
+                        self._refresh(key, url, params, raw, parse, True)
+                    return entry.value
+
+        if storage is None:
+            value, _ = await self._download(
+                key,
+                url,
+                params,
+                raw,
+                parse,
+                deadline,
+                entry,
+                use_cache
+            )
+            return value
+
+        # Only one client fetches the response, the others wait for it to
+        # be stored.
+        token = secrets.token_hex(16)
+        if not await storage.lock(storage_key, token, deadline.remaining()):
+            stored = await self._wait_stored(
+                key,
+                storage_key,
+                raw,
+                parse,
+                entry,
+                deadline
+            )
+            if stored is not None:
+                self.cache.hits += 1
+                return stored.value
+            # It failed or took too long, fetch it here instead.
+            token = None
+
+        written = None
+        try:
+            value, written = await self._download(
+                key,
+                url,
+                params,
+                raw,
+                parse,
+                deadline,
+                entry,
+                use_cache,
+                storage_key
+            )
+        finally:
+            if token is not None:
+                # Released once stored, so waiting clients find it.
+                storage.unlock(storage_key, token, written)
+        return value
+
+    async def _download(self,
+                        key: tuple,
+                        url: str,
+                        params: dict,
+                        raw: bool,
+                        parse: Optional[Callable[[Any], Any]],
+                        deadline: _Deadline,
+                        entry: Optional[CacheEntry],
+                        use_cache: bool,
+                        storage_key: str = None
+                        ) -> Tuple[Any, Optional[asyncio.Future]]:
+        storage = self.cache.storage if storage_key is not None else None
+        if use_cache:
+            self.cache.misses += 1
+
+        started = time.monotonic()
+        conditional = _Conditional(entry)
+        data = await self._request(
+            url,
             params=params,
-            **kwargs
-        ) as request:
-            raw = await request.json()
-            data = raw['data'] if 'data' in raw else raw
-
-            if request.status == 400:
-                raise InvalidParameters(data.get('error'))
-            elif request.status == 404:
-                raise NotFound(data.get('error'))
-            elif request.status == 403:
-                raise Private(data.get('error'))
-
-            return data
\ No newline at end of file
+            raw=raw,
+            deadline=deadline,
+            conditional=conditional
+        )
+        if conditional.not_modified:
+            self.cache.revalidated += 1
+            self.cache.refresh(
+                conditional.entry,
+                conditional.response_headers,
+                time.monotonic() - started
+            )
+            written = None
+            if storage is not None:
+                written = storage.refresh(storage_key, conditional.entry)
+            return conditional.entry.value, written
+
+        # Models with a content hash aren't built again when it hasn't
+        # changed, even if the response has.
+        content_hash = getattr(parse, 'content_hash', None)
+        if content_hash is not None:
+            content_hash = content_hash(data)
+
+        if (content_hash is not None
+                and entry is not None
+                and entry.hash == content_hash):
+            self.cache.unchanged += 1
+            value = entry.value
+        else:
+            value = parse(data) if parse is not None else data
+
+        written = None
+        if use_cache:
+            entry = self.cache.set(
+                key,
+                url,
+                value,
+                conditional.response_headers,
+                time.monotonic() - started,
+                content_hash,
+                len(conditional.body or b'')
+            )
+            if entry is not None and storage is not None:
+                written = storage.set(storage_key, CacheEntry(
+                    url,
+                    conditional.body,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.expires
+                ))
+        return value, written
+
+    async def _wait_stored(self,
+                           key: tuple,
+                           storage_key: str,
+                           raw: bool,
+                           parse: Optional[Callable[[Any], Any]],
+                           entry: Optional[CacheEntry],
+                           deadline: _Deadline
+                           ) -> Optional[CacheEntry]:
+        # Polls until the client holding the lock stores the response.
+        storage = self.cache.storage
+        delay = 0.05
+        while deadline.remaining() > 0:
+            await asyncio.sleep(min(delay, deadline.remaining()))
+            delay = min(delay * 2, 0.25)
+
+            stored = await self._restore(key, storage_key, raw, parse, entry)
+            if stored is not None:
+                return stored
+            if not await storage.locked(storage_key):
+                # The lock is released after storing, unless it failed.
+                return await self._restore(
+                    key,
+                    storage_key,
+                    raw,
+                    parse,
+                    entry
+                )
+        return None
+
+    async def _restore(self,
+                       key: tuple,
+                       storage_key: str,
+                       raw: bool,
+                       parse: Optional[Callable[[Any], Any]],
+                       current: Optional[CacheEntry] = None
+                       ) -> Optional[CacheEntry]:
+        # Returns the stored response unless it's no newer than current.
+        stored = await self.cache.storage.get(
+            storage_key,
+            current.expires if current is not None else 0.0
+        )
+        if stored is None:
+            return None
+
+        stored.size = len(stored.value)
+        try:
+            data = stored.value if raw else self._unwrap(self.loads(stored.value))
+        except ValueError:
+            return None
+        content_hash = getattr(parse, 'content_hash', None)
+        if content_hash is not None:
+            stored.hash = content_hash(data)
+        stored.value = parse(data) if parse is not None else data
+        return self.cache.restore(key, stored)
+
+    async def iter_chunks(self,
+                          url: str,
+                          params: dict = None,
+                          chunk_size: int = 65536,
+                          timeout: float = None,
+                          priority: Priority = None
+                          ) -> AsyncIterator[bytes]:
+        # Opening the response is retried like any other request, once the
+        # body has started streaming errors are raised to the caller. The
+        # timeout only applies to opening it.
+        with default_options(priority=priority):
+            response = await self._request(
+                url,
+                params=params,
+                stream=True,
+                deadline=_Deadline.after(timeout or self.get_timeout(url))
+            )
+        try:
+            async for chunk in self._iter_body(url, response, chunk_size):
+                yield chunk
+        finally:
+            await response.release()
+
+    async def stream_request(self,
+                             url: str,
+                             sink: Union[str, os.PathLike, Any],
+                             params: dict = None,
+                             chunk_size: int = 65536,
+                             timeout: float = None
+                             ) -> int:
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, 'wb') as file:
+                return await self.stream_request(
+                    url,
+                    file,
+                    params,
+                    chunk_size,
+                    timeout
+                )
+
+        write = sink.write if hasattr(sink, 'write') else sink
+        written = 0
+
+        chunks = self.iter_chunks(url, params, chunk_size, timeout)
+        async for chunk in chunks:
+            result = write(chunk)
+            if inspect.isawaitable(result):
+                await result
+            written += len(chunk)
+
+        return written
+
+    async def _request(self,
+                       url: str,
+                       method: str = 'GET',
+                       params: dict = None,
+                       raw: bool = False,
+                       stream: bool = False,
+                       deadline: _Deadline = None,
+                       conditional: _Conditional = None,
+                       **kwargs: Any
+                       ) -> Any:
+        deadline = deadline or _Deadline.after(self.get_timeout(url))
+        attempts = self.retry_policy.get_attempts(method)
+        attempt = 0
+        rate_limited = 0
+        rejected = 0
+        # Mirrors this call was sent to.
+        tried: Set[str] = set()
+
+        while True:
+            self.circuit_breaker.check(url)
+
+            if self.hedge_policy and method == 'GET' and not stream:
+                send = self._send_hedged(
+                    url,
+                    params,
+                    raw,
+                    tried,
+                    conditional,
+                    **kwargs
+                )
+            else:
+                send = self._send(
+                    url,
+                    method,
+                    params,
+                    raw,
+                    stream,
+                    tried,
+                    conditional,
+                    **kwargs
+                )
+
+            try:
+                data = await self._wait(send, deadline)
+            except RateLimited as exc:
+                rate_limited += 1
+                if (rate_limited > self.rate_limit_retries
+                        or exc.retry_after >= deadline.remaining()):
+                    raise
+                continue
+            except (
+                *self.transport.errors,
+                asyncio.TimeoutError,
+                UnknownHTTPException
+            ) as exc:
+                if deadline.expired():
+                    raise DeadlineExceeded(
+                        f'{url} did not answer in time.'
+                    ) from exc
+
+                # A key the API refused doesn't mean the endpoint failed,
+                # the request is sent again with another key.
+                if (self._is_key_rejected(exc)
+                        and rejected < len(self.key_pool.keys)):
+                    rejected += 1
+                    continue
+
+                if not self._is_transient(exc):
+                    self.circuit_breaker.record_success(url)
+                    raise
+
+                # Fails over to a mirror this call hasn't tried yet
+                # straight away, only the last one counts as a failure.
+                if (method in self.retry_policy.methods
+                        and self.mirrors.has_untried(tried)):
+                    continue
+
+                self.circuit_breaker.record_failure(url)
+
+                attempt += 1
+                delay = self.retry_policy.get_delay(attempt - 1)
+                # No point waiting for a retry that can't finish in time.
+                if attempt >= attempts or delay >= deadline.remaining():
+                    raise
+
+                await asyncio.sleep(delay)
+                continue
+            except Overloaded:
+                raise
+            except FortniteAPIException:
+                # The API answered, the endpoint itself is healthy.
+                self.circuit_breaker.record_success(url)
+                raise
+
+            self.circuit_breaker.record_success(url)
+            return data
+
+    @staticmethod
+    async def _wait(send: Awaitable[Any], deadline: _Deadline) -> Any:
+        # Like wait_for, except the deadline is read again when it passes,
+        # callers coalesced with the request may have pushed it back.
+        task = asyncio.ensure_future(send)
+        try:
+            while not deadline.expired():
+                done, _ = await asyncio.wait(
+                    [task],
+                    timeout=deadline.remaining()
+                )
+                if done:
+                    return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.wait([task])
+
+        raise asyncio.TimeoutError
+
+    def _is_key_rejected(self, exc: Exception) -> bool:
+        return (
+            self.key_pool is not None
+            and isinstance(exc, UnknownHTTPException)
+            and exc.status == 401
+            and not self.key_pool.get_delay()
+        )
+
+    def _is_transient(self, exc: Exception) -> bool:
+        if isinstance(exc, UnknownHTTPException):
+            return exc.status in self.retry_policy.statuses
+        return True
+
+    async def _send(self,
+                    url: str,
+                    method: str = 'GET',
+                    params: dict = None,
+                    raw: bool = False,
+                    stream: bool = False,
+                    tried: Set[str] = None,
+                    conditional: _Conditional = None,
+                    **kwargs: Any
+                    ) -> Any:
+        options = current_options()
+        ticket = await self.scheduler.acquire(
+            Priority.NORMAL if options.priority is None else options.priority,
+            options.tenant
+        )
+        # Whether the API kept up with the request, tells an adaptive
+        # concurrency limit when to back off.
+        ok = None
+        try:
+            response, body = await self._exchange(
+                url,
+                method,
+                params,
+                stream,
+                tried,
+                conditional,
+                **kwargs
+            )
+            ok = True
+        except (RateLimited, *self.transport.errors, asyncio.TimeoutError):
+            ok = False
+            raise
+        except UnknownHTTPException as exc:
+            ok = not (exc.status and exc.status >= 500)
+            raise
+        except FortniteAPIException:
+            ok = True
+            raise
+        finally:
+            # A streamed body is read outside of the scheduler, its slot
+            # only covers getting the response.
+            self.scheduler.release(ticket, endpoint_family(url), ok)
+
+        if stream:
+            # The caller is now responsible for releasing it.
+            return response
+
+        if conditional is not None:
+            conditional.response_headers = response.headers
+            if response.status == 304 and conditional.entry is not None:
+                conditional.not_modified = True
+                return None
+            conditional.body = body
+
+        if raw:
+            return body
+
+        if response.content_type != 'application/json':
+            raise UnknownHTTPException(
+                f'Unexpected {response.content_type} response from {url}.',
+                status=response.status
+            )
+
+        return self._unwrap(self.loads(body))
+
+    @staticmethod
+    def _unwrap(data: Any) -> Any:
+        return data['data'] if 'data' in data else data
+
+    async def _exchange(self,
+                        url: str,
+                        method: str = 'GET',
+                        params: dict = None,
+                        stream: bool = False,
+                        tried: Set[str] = None,
+                        conditional: _Conditional = None,
+                        **kwargs: Any
+                        ) -> Tuple[TransportResponse, Optional[bytes]]:
+        await self.rate_limiter.acquire(url)
+
+        # Started here too for clients used without being opened first.
+        self.mirrors.start(self._probe)
+        mirror = self.mirrors.select(tried or ())
+        mirror.requests += 1
+        if tried is not None:
+            tried.add(mirror.url)
+
+        headers = self.headers
+        if conditional is not None and conditional.headers:
+            headers = {**headers, **conditional.headers}
+
+        key = None
+        if self.key_pool is not None:
+            key = await self.key_pool.acquire()
+            headers = {**headers, 'Authorization': key.key}
+
+        try:
+            response = await self.transport.request(
+                method,
+                f'{mirror.url}{url}',
+                params=params,
+                headers=headers,
+                **kwargs
+            )
+        except BaseException as exc:
+            if key is not None:
+                self.key_pool.release(key)
+            if isinstance(exc, (*self.transport.errors, asyncio.TimeoutError)):
+                self.mirrors.record_failure(mirror)
+            raise
+
+        if response.status >= 500:
+            self.mirrors.record_failure(mirror)
+        else:
+            self.mirrors.record_success(mirror)
+
+        if key is not None:
+            self.key_pool.release(key, response.status, response.headers)
+
+        try:
+            await self._check_response(url, response, key)
+        except BaseException:
+            await response.release()
+            raise
+
+        if stream:
+            return response, None
+
+        try:
+            body = await self._read(url, response)
+        finally:
+            await response.release()
+
+        return response, body
+
+    async def _send_hedged(self,
+                           url: str,
+                           params: dict = None,
+                           raw: bool = False,
+                           tried: Set[str] = None,
+                           conditional: _Conditional = None,
+                           **kwargs: Any
+                           ) -> Any:
+        policy = self.hedge_policy
+        policy.requests += 1
+        started = time.monotonic()
+
+        primary = asyncio.ensure_future(
+            self._send(
+                url,
+                'GET',
+                params,
+                raw,
+                False,
+                tried,
+                conditional,
+                **kwargs
+            )
+        )
+        tasks = [primary]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.get_delay(url))
+            if not done and policy.can_hedge():
+                policy.hedges += 1
+                tasks.append(asyncio.ensure_future(
+                    self._send(
+                        url,
+                        'GET',
+                        params,
+                        raw,
+                        False,
+                        tried,
+                        conditional,
+                        **kwargs
+                    )
+                ))
+
+            pending = tasks
+            while True:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (task for task in done if task.exception() is None),
+                    None
+                )
+                # A failure only counts once every copy has failed.
+                if winner is None and pending:
+                    continue
+
+                winner = winner or next(iter(done))
+                if winner is not primary:
+                    policy.hedge_wins += 1
+
+                if winner.exception() is None:
+                    policy.record(url, time.monotonic() - started)
+                return winner.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Marks a losing copy's error as retrieved.
+                    task.exception()
+
+    async def _probe(self, url: str) -> bool:
+        try:
+            response = await self.transport.request(
+                'HEAD',
+                url,
+                headers=self.headers
+            )
+        except self.transport.errors:
+            return False
+
+        await response.release()
+        return response.status < 500
+
+    async def _check_response(self,
+                              url: str,
+                              response: TransportResponse,
+                              key: APIKey = None
+                              ) -> None:
+        # Quota headers describe the key the request was sent with, those
+        # are tracked by the key pool instead.
+        if key is None:
+            self.rate_limiter.update(url, response.headers)
+
+        if response.status == 429:
+            if key is None:
+                retry_after = parse_retry_after(response.headers)
+                self.rate_limiter.penalize(url, retry_after)
+            else:
+                # Retried straight away if another key is available.
+                retry_after = self.key_pool.get_delay()
+            raise RateLimited(
+                f'Rate limited on {url}, retry after '
+                f'{retry_after:.1f} seconds.',
+                retry_after=retry_after
+            )
+
+        if response.status < 400:
+            return
+
+        if response.content_type != 'application/json':
+            # Error pages from the CDN or a proxy are usually HTML.
+            body = (await self._read(url, response)).decode(errors='replace')
+            raise UnknownHTTPException(
+                f'Unexpected {response.status} response from {url}: '
+                f'{body[:200]}',
+                status=response.status
+            )
+
+        error = self.loads(await self._read(url, response)).get('error')
+        if response.status == 400:
+            raise InvalidParameters(error)
+        elif response.status == 404:
+            raise NotFound(error)
+        elif response.status == 403:
+            raise Private(error)
+
+        raise UnknownHTTPException(error, status=response.status)
+
+    def _record_transfer(self,
+                         url: str,
+                         response: TransportResponse,
+                         wire_bytes: int,
+                         decoded_bytes: int
+                         ) -> None:
+        family = endpoint_family(url)
+        if family not in self.transfer_stats:
+            self.transfer_stats[family] = TransferStats()
+
+        self.transfer_stats[family].add(
+            response.headers.get('Content-Encoding', 'identity'),
+            wire_bytes,
+            decoded_bytes
+        )
+
+    async def _read(self,
+                    url: str,
+                    response: TransportResponse
+                    ) -> bytes:
+        body = await response.read()
+        decompressor = get_decompressor(
+            response.headers.get('Content-Encoding')
+        )
+
+        decoded = body
+        if decompressor is not None:
+            decoded = decompressor.decompress(body) + decompressor.flush()
+
+        self._record_transfer(url, response, len(body), len(decoded))
+        return decoded
+
+    async def _iter_body(self,
+                         url: str,
+                         response: TransportResponse,
+                         chunk_size: int
+                         ) -> AsyncIterator[bytes]:
+        decompressor = get_decompressor(
+            response.headers.get('Content-Encoding')
+        )
+        wire_bytes = decoded_bytes = 0
+
+        async for chunk in response.iter_chunks(chunk_size):
+            wire_bytes += len(chunk)
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+
+            if chunk:
+                decoded_bytes += len(chunk)
+                yield chunk
+
+        if decompressor is not None:
+            chunk = decompressor.flush()
+            if chunk:
+                decoded_bytes += len(chunk)
+                yield chunk
+
+        self._record_transfer(url, response, wire_bytes, decoded_bytes)
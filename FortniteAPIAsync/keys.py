@@ -0,0 +1,154 @@
+from .ratelimit import parse_quota, parse_retry_after
+
+from typing import Iterable, List, Mapping, Optional, Union
+
+import asyncio
+import time
+
+
+class APIKey:
+    """Represents an API key in an :class:`APIKeyPool` along with its usage.
+
+    Attributes
+    ----------
+    key: :class:`str`
+        The API key.
+    requests: :class:`int`
+        Number of requests sent with this key.
+    rate_limited: :class:`int`
+        Number of 429 responses received with this key.
+    rejected: :class:`int`
+        Number of 401 responses received with this key.
+    remaining: Optional[:class:`int`]
+        Requests left in the current quota window as reported by the API,
+        ``None`` if the API hasn't reported it yet.
+    in_flight: :class:`int`
+        Number of requests currently being sent with this key.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.requests = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.remaining: Optional[int] = None
+        self.in_flight = 0
+
+        self._reset_at = 0.0
+        self._backoff_until = 0.0
+        self._strikes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'<APIKey key={self.key[:4]}... requests={self.requests} '
+            f'remaining={self.remaining}>'
+        )
+
+    @property
+    def backoff(self) -> float:
+        """:class:`float`: Seconds until the key is used again, ``0`` if
+        it's available."""
+        return max(self._backoff_until - time.monotonic(), 0)
+
+    def _quota(self) -> float:
+        if self.remaining is None or time.monotonic() >= self._reset_at:
+            return float('inf')
+        return self.remaining
+
+
+class APIKeyPool:
+    """Spreads requests across several API keys.
+
+    Every request uses the available key with the most quota left, keys
+    that are rate limited or rejected are backed off until they recover.
+
+    Attributes
+    ----------
+    keys: :class:`list`[:class:`APIKey`]
+        The keys in the pool.
+    backoff: :class:`float`
+        How long in seconds a rejected key is backed off for, doubled for
+        every consecutive rejection.
+    max_backoff: :class:`float`
+        Maximum time in seconds a key is backed off for.
+    """
+
+    def __init__(self,
+                 keys: Iterable[Union[str, APIKey]],
+                 backoff: float = 60.0,
+                 max_backoff: float = 3600.0
+                 ) -> None:
+        self.keys: List[APIKey] = [
+            key if isinstance(key, APIKey) else APIKey(key) for key in keys
+        ]
+        if not self.keys:
+            raise ValueError('APIKeyPool requires at least one key.')
+
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def get_key(self, key: str) -> Optional[APIKey]:
+        return next((api_key for api_key in self.keys if api_key.key == key),
+                    None)
+
+    def get_delay(self) -> float:
+        """Returns how long in seconds until a key is available."""
+        return min(key.backoff for key in self.keys)
+
+    def select(self) -> APIKey:
+        """Returns the key the next request should use, the one recovering
+        soonest if every key is backed off."""
+        available = [key for key in self.keys if not key.backoff]
+        if not available:
+            return min(self.keys, key=lambda key: key.backoff)
+
+        return max(
+            available,
+            key=lambda key: (key._quota() - key.in_flight, -key.requests)
+        )
+
+    async def acquire(self) -> APIKey:
+        key = self.select()
+        if key.backoff:
+            await asyncio.sleep(key.backoff)
+
+        key.requests += 1
+        key.in_flight += 1
+        return key
+
+    def release(self,
+                key: APIKey,
+                status: int = None,
+                headers: Mapping[str, str] = None
+                ) -> None:
+        key.in_flight -= 1
+        if status is None:
+            return
+
+        headers = headers or {}
+        remaining, reset = parse_quota(headers)
+        if remaining is not None:
+            key.remaining = remaining
+            key._reset_at = time.monotonic() + (reset or 0)
+
+        if status == 429:
+            key.rate_limited += 1
+            self._back_off(key, parse_retry_after(headers))
+        elif status == 401:
+            # Revoked or invalid keys won't recover on their own.
+            key.rejected += 1
+            key._strikes += 1
+            self._back_off(key, min(
+                self.backoff * 2 ** (key._strikes - 1),
+                self.max_backoff
+            ))
+        else:
+            key._strikes = 0
+            if key.remaining is not None and key.remaining <= 0 and reset:
+                self._back_off(key, reset)
+
+    def _back_off(self, key: APIKey, delay: float) -> None:
+        key._backoff_until = max(
+            key._backoff_until,
+            time.monotonic() + min(delay, self.max_backoff)
+        )
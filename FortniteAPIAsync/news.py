@@ -1,5 +1,7 @@
 import datetime
 
+from typing import Optional
+
 
 class News:
     """Represents Fortnite news.
@@ -25,6 +27,11 @@ class News:
 
         self.posts = [NewsPost(raw_post) for raw_post in data.get('motds', [])]
 
+    @staticmethod
+    def content_hash(data: dict) -> Optional[str]:
+        # See Shop.content_hash.
+        return data.get('hash')
+
 
 class NewsPost:
     """Represents a news post.
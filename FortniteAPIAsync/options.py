@@ -0,0 +1,91 @@
+from .enums import Priority
+
+from typing import Any, Hashable, Iterator, Optional
+
+import contextlib
+import contextvars
+
+
+class RequestOptions:
+    """Represents the options applied to requests made in the current
+    context, see :func:`request_options`.
+
+    Attributes
+    ----------
+    priority: Optional[:class:`Priority`]
+        Priority of the requests, ``None`` uses the endpoint's default.
+    tenant: Optional[:class:`str`]
+        Who the requests are made for, :class:`RequestScheduler` shares
+        capacity fairly between tenants.
+    cache: Optional[:class:`bool`]
+        ``False`` sends the requests to the API without looking up or
+        storing responses in :class:`ResponseCache`.
+    """
+
+    def __init__(self,
+                 priority: Optional[Priority] = None,
+                 tenant: Optional[Hashable] = None,
+                 cache: Optional[bool] = None
+                 ) -> None:
+        self.priority = priority
+        self.tenant = tenant
+        self.cache = cache
+
+    def replace(self, **options: Any) -> 'RequestOptions':
+        copy = RequestOptions.__new__(RequestOptions)
+        copy.__dict__.update(self.__dict__)
+        for name, value in options.items():
+            if not hasattr(copy, name):
+                raise TypeError(f'Unknown request option: {name}')
+            setattr(copy, name, value)
+        return copy
+
+
+_options: contextvars.ContextVar[RequestOptions] = contextvars.ContextVar(
+    'request_options',
+    default=RequestOptions()
+)
+
+
+def current_options() -> RequestOptions:
+    return _options.get()
+
+
+@contextlib.contextmanager
+def request_options(**options: Any) -> Iterator[RequestOptions]:
+    """Applies options to every request made inside the block, including
+    requests made by tasks created inside it.
+
+    .. code-block:: python3
+
+        with FortniteAPIAsync.request_options(priority=Priority.BACKGROUND):
+            await client.cosmetics.get_all_cosmetics()
+
+        with FortniteAPIAsync.request_options(tenant=guild.id):
+            await client.get_stats(name)
+
+        with FortniteAPIAsync.request_options(cache=False):
+            await client.get_map()
+
+    Parameters
+    ----------
+    **options
+        Any attribute of :class:`RequestOptions`, options that aren't
+        given keep their current value.
+    """
+    token = _options.set(_options.get().replace(**options))
+    try:
+        yield _options.get()
+    finally:
+        _options.reset(token)
+
+
+@contextlib.contextmanager
+def default_options(**options: Any) -> Iterator[RequestOptions]:
+    # Like request_options, but options already set by the caller win.
+    current = _options.get()
+    with request_options(**{
+        name: value for name, value in options.items()
+        if value is not None and getattr(current, name) is None
+    }) as applied:
+        yield applied
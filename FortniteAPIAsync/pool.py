@@ -0,0 +1,153 @@
+from typing import Dict, Optional
+
+import aiohttp
+import asyncio
+
+
+class PoolConfig:
+    """Represents the connection pool settings used by :class:`HTTPClient`.
+
+    Attributes
+    ----------
+    limit: :class:`int`
+        Maximum number of simultaneous connections, ``0`` for no limit.
+    limit_per_host: :class:`int`
+        Maximum number of simultaneous connections to a single host,
+        ``0`` for no limit.
+    keepalive_timeout: :class:`float`
+        How long in seconds an idle connection is kept open for reuse.
+    use_dns_cache: :class:`bool`
+        Whether resolved hostnames are cached.
+    ttl_dns_cache: Optional[:class:`int`]
+        How long in seconds a resolved hostname is cached for,
+        ``None`` caches forever.
+    resolver: Optional[:class:`aiohttp.abc.AbstractResolver`]
+        Custom DNS resolver, defaults to aiohttp's resolver.
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: float = 30.0,
+                 use_dns_cache: bool = True,
+                 ttl_dns_cache: Optional[int] = 300,
+                 resolver: Optional[aiohttp.abc.AbstractResolver] = None
+                 ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.use_dns_cache = use_dns_cache
+        self.ttl_dns_cache = ttl_dns_cache
+        self.resolver = resolver
+
+    def create_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.use_dns_cache,
+            ttl_dns_cache=self.ttl_dns_cache,
+            resolver=self.resolver
+        )
+
+    def _key(self) -> tuple:
+        return (
+            self.limit,
+            self.limit_per_host,
+            self.keepalive_timeout,
+            self.use_dns_cache,
+            self.ttl_dns_cache,
+            id(self.resolver)
+        )
+
+
+class _SharedSession:
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+        self.references = 0
+        self.close_handle: Optional[asyncio.TimerHandle] = None
+
+
+class SessionRegistry:
+    """Shares one pooled session between every :class:`APIClient` created
+    with ``shared_session=True`` on the same event loop.
+
+    Sessions are reference counted, closing a client only releases its
+    reference. Once a session is no longer referenced it is kept open for
+    ``linger`` seconds so short-lived clients can keep reusing its
+    connections.
+
+    Attributes
+    ----------
+    linger: :class:`float`
+        How long in seconds an unreferenced session is kept open.
+    """
+
+    def __init__(self, linger: float = 30.0) -> None:
+        self.linger = linger
+        self._sessions: Dict[tuple, _SharedSession] = {}
+
+    def _purge(self) -> None:
+        for key, shared in list(self._sessions.items()):
+            if key[0].is_closed() or shared.session.closed:
+                del self._sessions[key]
+
+    async def acquire(self, pool: PoolConfig) -> aiohttp.ClientSession:
+        self._purge()
+
+        key = (asyncio.get_running_loop(), pool._key())
+        shared = self._sessions.get(key)
+        if shared is None:
+            shared = self._sessions[key] = _SharedSession(
+                aiohttp.ClientSession(connector=pool.create_connector())
+            )
+
+        if shared.close_handle is not None:
+            shared.close_handle.cancel()
+            shared.close_handle = None
+
+        shared.references += 1
+        return shared.session
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        for key, shared in self._sessions.items():
+            if shared.session is session:
+                break
+        else:
+            return
+
+        shared.references -= 1
+        if shared.references > 0:
+            return
+
+        if self.linger <= 0:
+            del self._sessions[key]
+            await session.close()
+            return
+
+        def _expire() -> None:
+            if self._sessions.get(key) is shared and not shared.references:
+                del self._sessions[key]
+                asyncio.ensure_future(session.close())
+
+        shared.close_handle = key[0].call_later(self.linger, _expire)
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes every shared session belonging to the running event loop,
+        regardless of how many clients still reference it.
+        """
+        loop = asyncio.get_running_loop()
+        for key, shared in list(self._sessions.items()):
+            if key[0] is not loop:
+                continue
+
+            if shared.close_handle is not None:
+                shared.close_handle.cancel()
+
+            del self._sessions[key]
+            await shared.session.close()
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,176 @@
+from .utils import endpoint_family
+
+from typing import Dict, Mapping, Optional, Tuple
+
+import asyncio
+import email.utils
+import time
+
+
+class TokenBucket:
+    """Represents an asynchronous token bucket.
+
+    Callers that find the bucket empty are queued in arrival order until
+    a token becomes available instead of failing.
+
+    Attributes
+    ----------
+    rate: :class:`float`
+        How many tokens are added to the bucket per second.
+    capacity: :class:`float`
+        Maximum number of tokens the bucket can hold, which is also the
+        largest burst allowed.
+    """
+
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                delay = self._paused_until - time.monotonic()
+                if delay <= 0:
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+
+                    delay = (1 - self._tokens) / self.rate
+
+                await asyncio.sleep(delay)
+
+    def pause(self, delay: float) -> None:
+        self._paused_until = max(
+            self._paused_until,
+            time.monotonic() + delay
+        )
+
+    def update(self, remaining: int, reset: float = None) -> None:
+        self._refill()
+        self._tokens = min(self._tokens, remaining)
+        if remaining <= 0 and reset:
+            self.pause(reset)
+
+
+class RateLimiter:
+    """Applies a :class:`TokenBucket` to each configured endpoint family
+    and keeps track of ``Retry-After`` and rate limit headers sent back by
+    the API.
+
+    Attributes
+    ----------
+    limits: :class:`dict`[:class:`str`, :class:`TokenBucket`]
+        Buckets keyed by the path prefix they apply to,
+        e.g. ``'/v2/stats'``. The longest matching prefix is used.
+    """
+
+    def __init__(self, limits: Mapping[str, TokenBucket] = None) -> None:
+        self.limits: Dict[str, TokenBucket] = dict(limits or {})
+        self._paused_until: Dict[str, float] = {}
+
+    def get_bucket(self, url: str) -> Optional[TokenBucket]:
+        matches = [prefix for prefix in self.limits if url.startswith(prefix)]
+        if matches:
+            return self.limits[max(matches, key=len)]
+
+    async def acquire(self, url: str) -> None:
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            return await bucket.acquire()
+
+        # Endpoints without a bucket still honour Retry-After.
+        delay = self._paused_until.get(endpoint_family(url), 0)
+        delay -= time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, url: str, retry_after: float) -> None:
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            return bucket.pause(retry_after)
+
+        family = endpoint_family(url)
+        self._paused_until[family] = max(
+            self._paused_until.get(family, 0),
+            time.monotonic() + retry_after
+        )
+
+    def update(self, url: str, headers: Mapping[str, str]) -> None:
+        bucket = self.get_bucket(url)
+        remaining, reset = parse_quota(headers)
+        if bucket is None or remaining is None:
+            return
+
+        bucket.update(remaining, reset)
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+
+def parse_quota(headers: Mapping[str, str]
+                ) -> Tuple[Optional[int], Optional[float]]:
+    remaining = _header_number(
+        headers,
+        'X-RateLimit-Remaining',
+        'RateLimit-Remaining'
+    )
+    reset = _header_number(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+    if reset is not None and reset > 1e9:
+        # Some APIs send the reset as a unix timestamp.
+        reset -= time.time()
+
+    return (int(remaining) if remaining is not None else None), reset
+
+
+def parse_retry_after(headers: Mapping[str, str],
+                      default: float = 1.0
+                      ) -> float:
+    value = headers.get('Retry-After')
+    if value is None:
+        reset = _header_number(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        if reset is not None and reset > 1e9:
+            reset -= time.time()
+        return max(reset, 0) if reset is not None else default
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+
+    return max(date.timestamp() - time.time(), 0)
@@ -0,0 +1,123 @@
+from .exceptions import CircuitOpen
+from .utils import endpoint_family
+
+from typing import Dict, Iterable
+
+import random
+import time
+
+
+class RetryPolicy:
+    """Represents how failed requests are retried.
+
+    Only idempotent methods are retried, on connection errors, timeouts
+    and the configured status codes. Delays grow exponentially with full
+    jitter so that many clients recovering together don't retry in sync.
+
+    Attributes
+    ----------
+    attempts: :class:`int`
+        Maximum number of attempts, including the first one.
+    backoff: :class:`float`
+        Base delay in seconds, doubled after each attempt.
+    max_backoff: :class:`float`
+        Maximum delay in seconds between two attempts.
+    jitter: :class:`bool`
+        Whether delays are randomised between 0 and the computed delay.
+    statuses: :class:`frozenset`[:class:`int`]
+        Status codes that are considered transient.
+    methods: :class:`frozenset`[:class:`str`]
+        HTTP methods that are safe to retry.
+    """
+
+    def __init__(self,
+                 attempts: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 10.0,
+                 jitter: bool = True,
+                 statuses: Iterable[int] = (500, 502, 503, 504),
+                 methods: Iterable[str] = ('GET', 'HEAD')
+                 ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+
+    def get_attempts(self, method: str) -> int:
+        return self.attempts if method in self.methods else 1
+
+    def get_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """Fails requests to an endpoint family fast while it keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    for that family opens and requests raise :exc:`CircuitOpen` without
+    touching the network. Once ``recovery_timeout`` has passed a single
+    request is let through, closing the circuit again if it succeeds.
+
+    Attributes
+    ----------
+    failure_threshold: :class:`int`
+        Consecutive failures needed to open a circuit, ``0`` disables the
+        breaker.
+    recovery_timeout: :class:`float`
+        How long in seconds a circuit stays open before a request is let
+        through to probe the endpoint.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0
+                 ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def is_open(self, url: str) -> bool:
+        circuit = self._circuits.get(endpoint_family(url))
+        return circuit is not None and circuit.opened_at is not None
+
+    def check(self, url: str) -> None:
+        family = endpoint_family(url)
+        circuit = self._circuits.get(family)
+        if circuit is None or circuit.opened_at is None:
+            return
+
+        now = time.monotonic()
+        remaining = circuit.opened_at + self.recovery_timeout - now
+        if remaining > 0:
+            raise CircuitOpen(
+                f'{family} is failing, requests are paused for '
+                f'{remaining:.1f} more seconds.'
+            )
+
+        # Let this request probe the endpoint, everyone else keeps failing
+        # fast until it reports back or another timeout passes.
+        circuit.opened_at = now
+        circuit.probing = True
+
+    def record_success(self, url: str) -> None:
+        self._circuits.pop(endpoint_family(url), None)
+
+    def record_failure(self, url: str) -> None:
+        if not self.failure_threshold:
+            return
+
+        circuit = self._circuits.setdefault(endpoint_family(url), _Circuit())
+        circuit.failures += 1
+        if circuit.probing or circuit.failures >= self.failure_threshold:
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
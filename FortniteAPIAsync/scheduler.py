@@ -0,0 +1,459 @@
+from .enums import Priority
+from .exceptions import Overloaded
+
+from typing import Dict, Hashable, List, Mapping, Optional
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+
+
+class PriorityStats:
+    """Represents the queue metrics of a :class:`Priority` class.
+
+    Attributes
+    ----------
+    queued: :class:`int`
+        Number of requests currently waiting.
+    admitted: :class:`int`
+        Number of requests that were sent.
+    shed: :class:`int`
+        Number of requests rejected with :exc:`Overloaded`.
+    wait_time: :class:`float`
+        Total time in seconds admitted requests spent waiting.
+    max_wait_time: :class:`float`
+        Longest time in seconds a request spent waiting.
+    """
+
+    def __init__(self) -> None:
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @property
+    def mean_wait_time(self) -> float:
+        """:class:`float`: Average time in seconds admitted requests spent
+        waiting."""
+        return self.wait_time / self.admitted if self.admitted else 0.0
+
+    def _admit(self, waited: float) -> None:
+        self.admitted += 1
+        self.wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+
+
+class TenantStats(PriorityStats):
+    """Represents the queue metrics and throughput of a tenant.
+
+    Attributes
+    ----------
+    in_flight: :class:`int`
+        Number of requests currently being sent.
+    completed: :class:`int`
+        Number of requests that finished, successfully or not.
+    latency: :class:`float`
+        Total time in seconds completed requests took, waiting included.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.completed = 0
+        self.latency = 0.0
+
+        self._finish_tag = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """:class:`float`: Average time in seconds completed requests took,
+        waiting included."""
+        return self.latency / self.completed if self.completed else 0.0
+
+
+class Ticket:
+    """Represents a request admitted by :class:`RequestScheduler`, passed
+    back to :meth:`RequestScheduler.release` once it's done."""
+
+    __slots__ = ('priority', 'tenant', 'started', 'admitted')
+
+    def __init__(self,
+                 priority: Priority,
+                 tenant: Optional[Hashable],
+                 started: float
+                 ) -> None:
+        self.priority = priority
+        self.tenant = tenant
+        self.started = started
+        self.admitted = time.monotonic()
+
+
+class AdaptiveLimit:
+    """Adjusts the concurrency limit of a :class:`RequestScheduler` to what
+    the API can currently sustain.
+
+    The limit grows by about one per round trip while it's being used and
+    latency stays close to its usual level (additive increase). It's cut
+    by :attr:`backoff` on latency spikes, 429s, 5xx responses and
+    connection errors (multiplicative decrease), at most once per round
+    trip.
+
+    Latency is compared per endpoint family, a full cosmetics listing is
+    expected to take longer than an AES lookup.
+
+    Attributes
+    ----------
+    limit: :class:`float`
+        The current limit, rounded down when used.
+    min_limit: :class:`int`
+        The limit never drops below this.
+    max_limit: :class:`int`
+        The limit never grows above this.
+    backoff: :class:`float`
+        Factor the limit is multiplied by when it's cut.
+    tolerance: :class:`float`
+        How many times slower than usual a response has to be to count as
+        a latency spike.
+    smoothing: :class:`float`
+        Weight given to each slower response in the usual latency, faster
+        responses replace it.
+    warm_up: :class:`int`
+        Responses needed for an endpoint family before its latency spikes
+        are detected.
+    increases: :class:`int`
+        Number of times the limit was raised.
+    decreases: :class:`int`
+        Number of times the limit was cut.
+    """
+
+    def __init__(self,
+                 initial: int = 20,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 backoff: float = 0.5,
+                 tolerance: float = 2.0,
+                 smoothing: float = 0.01,
+                 warm_up: int = 10
+                 ) -> None:
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.warm_up = warm_up
+        self.increases = 0
+        self.decreases = 0
+
+        # Usual latency and number of responses per endpoint family.
+        self._latencies: Dict[str, List[float]] = {}
+        self._last_decrease = 0.0
+
+    def update(self,
+               family: str,
+               latency: float,
+               ok: bool,
+               in_flight: int
+               ) -> None:
+        usual = self._latencies.get(family)
+        if usual is None:
+            usual = self._latencies[family] = [latency, 0]
+
+        spike = (
+            ok and usual[1] >= self.warm_up
+            and latency > usual[0] * self.tolerance
+        )
+        if ok:
+            # Follows improvements straight away but rises slowly, so a
+            # backlog building up isn't mistaken for the usual latency.
+            if latency < usual[0]:
+                usual[0] = latency
+            else:
+                usual[0] += self.smoothing * (latency - usual[0])
+            usual[1] += 1
+
+        if not ok or spike:
+            now = time.monotonic()
+            # Responses already in flight when the API slowed down report
+            # the same congestion, one cut per round trip is enough.
+            if now - self._last_decrease >= max(latency, usual[0]):
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.decreases += 1
+        elif in_flight * 2 >= self.limit:
+            # Only grows while at least half of the limit is used, an idle
+            # client says nothing about what the API can take.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+
+
+class _Waiter:
+    __slots__ = ('priority', 'tenant', 'tag', 'sequence', 'future', 'enqueued')
+
+    def __init__(self,
+                 priority: Priority,
+                 tenant: Optional[Hashable],
+                 tag: float,
+                 sequence: int
+                 ) -> None:
+        self.priority = priority
+        self.tenant = tenant
+        self.tag = tag
+        self.sequence = sequence
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+
+    def __lt__(self, other: '_Waiter') -> bool:
+        return (
+            (self.priority, self.tag, self.sequence)
+            < (other.priority, other.tag, other.sequence)
+        )
+
+
+class RequestScheduler:
+    """Limits how many requests are sent at once and decides which waiting
+    request goes next.
+
+    Higher priority requests are always sent first. Within a priority,
+    tenants are served by weighted fair queuing so a tenant sending many
+    requests can't starve the others. Once too many requests are waiting,
+    or one waited for too long, lower priority requests are shed by
+    raising :exc:`Overloaded`. :attr:`Priority.INTERACTIVE` requests are
+    never shed.
+
+    Attributes
+    ----------
+    limit: Optional[:class:`int`]
+        Maximum number of requests in flight, ``None`` for no limit.
+    max_queue: Optional[:class:`int`]
+        Maximum number of waiting requests before the lowest priority one
+        is shed, ``None`` for no limit.
+    max_wait: :class:`dict`[:class:`Priority`, :class:`float`]
+        Maximum time in seconds a request of each priority may wait before
+        it's shed.
+    weights: :class:`dict`[:class:`str`, :class:`float`]
+        Share of each tenant relative to the others, tenants that aren't
+        listed have a weight of ``1``.
+    max_share: Optional[:class:`float`]
+        Largest fraction of :attr:`limit` a single tenant may use while
+        other tenants are waiting, ``None`` for no limit.
+    adaptive: Optional[:class:`AdaptiveLimit`]
+        Adjusts :attr:`limit` from the responses received, ``None`` keeps
+        it fixed.
+    stats: :class:`dict`[:class:`Priority`, :class:`PriorityStats`]
+        Queue metrics for each priority.
+    tenants: :class:`dict`[:class:`str`, :class:`TenantStats`]
+        Queue metrics for each tenant seen so far, requests without a
+        tenant are counted under ``None``.
+    """
+
+    def __init__(self,
+                 limit: int = None,
+                 max_queue: int = None,
+                 max_wait: Mapping[Priority, float] = None,
+                 weights: Mapping[Hashable, float] = None,
+                 max_share: float = None,
+                 adaptive: AdaptiveLimit = None
+                 ) -> None:
+        self.adaptive = adaptive
+        self.limit = int(adaptive.limit) if adaptive else limit
+        self.max_queue = max_queue
+        self.max_wait: Dict[Priority, float] = dict(max_wait or {})
+        self.weights: Dict[Hashable, float] = dict(weights or {})
+        self.max_share = max_share
+        self.stats: Dict[Priority, PriorityStats] = {
+            priority: PriorityStats() for priority in Priority
+        }
+        self.tenants: Dict[Optional[Hashable], TenantStats] = {}
+
+        self.in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._counter = itertools.count()
+        self._virtual_time = 0.0
+
+    @property
+    def queued(self) -> int:
+        """:class:`int`: Number of requests currently waiting."""
+        return sum(stats.queued for stats in self.stats.values())
+
+    def _has_capacity(self) -> bool:
+        return self.limit is None or self.in_flight < self.limit
+
+    def _tenant(self, tenant: Optional[Hashable]) -> TenantStats:
+        stats = self.tenants.get(tenant)
+        if stats is None:
+            stats = self.tenants[tenant] = TenantStats()
+        return stats
+
+    def _at_share(self, tenant: Optional[Hashable]) -> bool:
+        if self.max_share is None or self.limit is None:
+            return False
+
+        share = max(math.floor(self.limit * self.max_share), 1)
+        return self._tenant(tenant).in_flight >= share
+
+    def _next_tag(self, tenant: Optional[Hashable]) -> float:
+        # Self-clocked fair queuing: each request of a tenant finishes
+        # 1 / weight after its previous one in virtual time, a tenant that
+        # has been idle starts again from the current virtual time.
+        stats = self._tenant(tenant)
+        stats._finish_tag = (
+            max(self._virtual_time, stats._finish_tag)
+            + 1 / self.weights.get(tenant, 1.0)
+        )
+        return stats._finish_tag
+
+    def _admit(self,
+               priority: Priority,
+               tenant: Optional[Hashable],
+               enqueued: float
+               ) -> Ticket:
+        waited = time.monotonic() - enqueued
+        self.stats[priority]._admit(waited)
+        stats = self._tenant(tenant)
+        stats._admit(waited)
+        stats.in_flight += 1
+        self.in_flight += 1
+        return Ticket(priority, tenant, enqueued)
+
+    async def acquire(self,
+                      priority: Priority = Priority.NORMAL,
+                      tenant: Hashable = None
+                      ) -> Ticket:
+        if self._has_capacity() and not self.queued:
+            return self._admit(priority, tenant, time.monotonic())
+
+        # Only queued requests are tagged, requests sent while there was
+        # spare capacity took nothing from other tenants.
+        waiter = _Waiter(
+            priority,
+            tenant,
+            self._next_tag(tenant),
+            next(self._counter)
+        )
+        heapq.heappush(self._queue, waiter)
+        self.stats[priority].queued += 1
+        self._tenant(tenant).queued += 1
+
+        if self.max_queue is not None and self.queued > self.max_queue:
+            self._shed_lowest()
+
+        try:
+            await asyncio.wait(
+                [waiter.future],
+                timeout=self.max_wait.get(priority)
+            )
+        except asyncio.CancelledError:
+            if (waiter.future.done() and not waiter.future.cancelled()
+                    and waiter.future.exception() is None):
+                # Admitted just as the caller gave up.
+                self.release(waiter.future.result())
+            else:
+                self._discard(waiter)
+            raise
+
+        if not waiter.future.done():
+            self._discard(waiter)
+            self._count_shed(waiter)
+            raise Overloaded(
+                f'{priority.name} request shed, it waited too long.'
+            )
+
+        # Raises Overloaded if the request was shed.
+        return waiter.future.result()
+
+    def release(self,
+                ticket: Ticket,
+                family: str = None,
+                ok: bool = None
+                ) -> None:
+        """Releases the slot of an admitted request.
+
+        Parameters
+        ----------
+        ticket: :class:`Ticket`
+            The ticket returned by :meth:`acquire`.
+        family: Optional[:class:`str`]
+            The endpoint family the request was sent to.
+        ok: Optional[:class:`bool`]
+            Whether the API handled the request without being overloaded,
+            ``None`` if the request didn't finish, e.g. it was cancelled.
+        """
+        if self.adaptive is not None and ok is not None:
+            self.adaptive.update(
+                family,
+                time.monotonic() - ticket.admitted,
+                ok,
+                self.in_flight
+            )
+            self.limit = int(self.adaptive.limit)
+
+        self.in_flight -= 1
+        stats = self._tenant(ticket.tenant)
+        stats.in_flight -= 1
+        stats.completed += 1
+        stats.latency += time.monotonic() - ticket.started
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        deferred = []
+        while self._queue and self._has_capacity():
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+
+            if self._at_share(waiter.tenant):
+                deferred.append(waiter)
+                continue
+
+            self._start(waiter)
+
+        if deferred and self._has_capacity() and not self._queue:
+            # Only tenants at their share are waiting, capacity shouldn't
+            # sit idle.
+            self._start(deferred.pop(0))
+
+        for waiter in deferred:
+            heapq.heappush(self._queue, waiter)
+
+    def _start(self, waiter: _Waiter) -> None:
+        self._virtual_time = max(self._virtual_time, waiter.tag)
+        self._dequeue(waiter)
+        waiter.future.set_result(
+            self._admit(waiter.priority, waiter.tenant, waiter.enqueued)
+        )
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        self.stats[waiter.priority].queued -= 1
+        self._tenant(waiter.tenant).queued -= 1
+
+    def _discard(self, waiter: _Waiter) -> None:
+        if not waiter.future.done():
+            self._dequeue(waiter)
+            waiter.future.cancel()
+
+    def _count_shed(self, waiter: _Waiter) -> None:
+        self.stats[waiter.priority].shed += 1
+        self._tenant(waiter.tenant).shed += 1
+
+    def _shed_lowest(self) -> None:
+        candidates = [
+            waiter for waiter in self._queue
+            if not waiter.future.done()
+            and waiter.priority > Priority.INTERACTIVE
+        ]
+        if not candidates:
+            return
+
+        # The lowest priority request that would be served last, which
+        # belongs to whichever tenant is furthest over its share.
+        waiter = max(candidates)
+        self._dequeue(waiter)
+        self._count_shed(waiter)
+        waiter.future.set_exception(Overloaded(
+            f'{waiter.priority.name} request shed, too many requests '
+            f'are queued.'
+        ))
@@ -1,5 +1,7 @@
 import datetime
 
+from typing import Optional
+
 from .cosmetics import (
     BRCosmetic,
     TrackCosmetic,
@@ -351,3 +353,31 @@ class Shop:
             ShopEntry(raw_entry) for raw_entry in data.get('entries', [])
         ]
 
+    @staticmethod
+    def content_hash(data: dict) -> Optional[str]:
+        # Lets the client return the cached shop when the API sends the
+        # same content again, instead of building it from scratch.
+        return data.get('hash')
+
+    @property
+    def next_rotation(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`]: When the first offer leaves
+        the shop, or the next midnight UTC if it has no offers. ``None``
+        once that time has passed, the shop is outdated."""
+        # Offers without dates default to the epoch.
+        out_dates = [
+            entry.out_date for entry in self.entries
+            if entry.out_date > entry.in_date
+        ]
+        if out_dates:
+            rotation = min(out_dates)
+        else:
+            # The shop rotates daily at midnight UTC.
+            rotation = datetime.datetime.combine(
+                self.date.date() + datetime.timedelta(days=1),
+                datetime.time(),
+                datetime.timezone.utc
+            )
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return rotation if rotation > now else None
\ No newline at end of file
@@ -0,0 +1,481 @@
+from .cache import CacheEntry
+from .compression import compress, decompress
+from .exceptions import UnknownHTTPException
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union
+)
+
+import asyncio
+import os
+import sqlite3
+import time
+import zlib
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+class Storage(ABC):
+    """Base class for the backends :class:`ResponseCache` keeps response
+    bodies in, so they're available after a restart and to other clients.
+
+    Entries are :class:`CacheEntry` whose ``value`` is the undecoded body.
+    Writes don't block callers, :meth:`close` waits for them.
+
+    Attributes
+    ----------
+    exceptions: :class:`tuple`[:class:`type`]
+        Exceptions raised by the backend when it can't be used, reads
+        failing with them are treated as cache misses.
+    reads: :class:`int`
+        Number of responses read.
+    writes: :class:`int`
+        Number of responses written.
+    errors: :class:`int`
+        Number of reads and writes that failed.
+    """
+
+    exceptions: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+
+        self._pending: Set[asyncio.Future] = set()
+
+    async def get(self,
+                  key: str,
+                  newer_than: float = 0.0
+                  ) -> Optional[CacheEntry]:
+        """|coro|
+
+        Returns the response stored under ``key`` if it expires after the
+        ``newer_than`` UNIX timestamp.
+        """
+        try:
+            entry = await self._get(key, newer_than)
+        except (*self.exceptions, zlib.error, UnknownHTTPException,
+                ValueError):
+            # Unreachable, damaged or compressed with zstd by a client
+            # that had it installed, it's fetched again.
+            self.errors += 1
+            return None
+
+        if entry is not None:
+            self.reads += 1
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> asyncio.Future:
+        """Stores ``entry`` under ``key``, returns a future completed once
+        it's written."""
+        return self._submit(self._set(key, entry), count=True)
+
+    def refresh(self, key: str, entry: CacheEntry) -> asyncio.Future:
+        """Updates the validators and expiry of the response stored under
+        ``key`` from ``entry``, returns a future completed once it's
+        written."""
+        return self._submit(self._refresh(key, entry), count=True)
+
+    async def lock(self, key: str, token: str, timeout: float) -> bool:
+        """|coro|
+
+        Takes the lock of ``key`` for ``timeout`` seconds so only one
+        client fetches the response, returns whether it was taken. Backends
+        that aren't shared always return ``True``.
+        """
+        return True
+
+    def unlock(self,
+               key: str,
+               token: str,
+               after: Awaitable[Any] = None
+               ) -> asyncio.Future:
+        """Releases the lock of ``key`` if ``token`` still holds it, once
+        ``after`` is done."""
+        async def _unlock() -> None:
+            if after is not None:
+                await asyncio.wait([after])
+            await self._unlock(key, token)
+
+        return self._submit(_unlock())
+
+    async def locked(self, key: str) -> bool:
+        """|coro|
+
+        Returns whether another client holds the lock of ``key``.
+        """
+        return False
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """|coro|
+
+        Drops every stored response.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """|coro|
+
+        Waits for pending writes and closes the backend. It's opened again
+        when used.
+        """
+        if self._pending:
+            await asyncio.wait(self._pending)
+
+    @abstractmethod
+    async def _get(self,
+                   key: str,
+                   newer_than: float
+                   ) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _refresh(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    async def _unlock(self, key: str, token: str) -> None:
+        pass
+
+    def _submit(self, coro: Awaitable[Any], count: bool = False
+                ) -> asyncio.Future:
+        future = asyncio.ensure_future(coro)
+        self._pending.add(future)
+
+        def done(_: asyncio.Future) -> None:
+            self._pending.discard(future)
+            if future.cancelled() or future.exception() is not None:
+                # Nothing waits on writes, the response just won't be
+                # there for the next client.
+                self.errors += 1
+            elif count:
+                self.writes += 1
+
+        future.add_done_callback(done)
+        return future
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    encoding TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires REAL NOT NULL,
+    stored REAL NOT NULL
+)
+'''
+
+
+class SQLiteStorage(Storage):
+    """Keeps response bodies in a SQLite database, shared by processes on
+    the same host.
+
+    Bodies are compressed with zstd when it's installed, zlib otherwise.
+    Queries run on a dedicated thread and never block the event loop.
+
+    Attributes
+    ----------
+    path: :class:`str`
+        Path of the database file, created if it doesn't exist.
+    max_entries: :class:`int`
+        Maximum number of responses kept, the oldest ones are dropped
+        first.
+    timeout: :class:`float`
+        Seconds to wait for another process holding a lock on the
+        database.
+    """
+
+    exceptions = (sqlite3.Error,)
+
+    def __init__(self,
+                 path: Union[str, os.PathLike],
+                 max_entries: int = 1024,
+                 timeout: float = 5.0
+                 ) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.timeout = timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def clear(self) -> None:
+        await self._run(self._execute, 'DELETE FROM responses')
+
+    async def close(self) -> None:
+        await super().close()
+        if self._executor is not None:
+            await self._run(self._close)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _get(self,
+                   key: str,
+                   newer_than: float
+                   ) -> Optional[CacheEntry]:
+        return await self._run(self._select, key, newer_than)
+
+    async def _set(self, key: str, entry: CacheEntry) -> None:
+        await self._run(self._insert, key, entry)
+
+    async def _refresh(self, key: str, entry: CacheEntry) -> None:
+        await self._run(
+            self._execute,
+            'UPDATE responses SET etag = ?, last_modified = ?, expires = ?, '
+            'stored = ? WHERE key = ?',
+            entry.etag, entry.last_modified, entry.expires, time.time(), key
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix='FortniteAPIAsync-sqlite'
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            func,
+            *args
+        )
+
+    # Everything below runs on the storage thread.
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            # Readers don't block the writer of another process.
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, query: str, *params: Any) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute(query, params)
+
+    def _select(self, key: str, newer_than: float) -> Optional[CacheEntry]:
+        row = self._connect().execute(
+            'SELECT url, body, encoding, etag, last_modified, expires '
+            'FROM responses WHERE key = ? AND expires > ?',
+            (key, newer_than)
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, body, encoding, etag, last_modified, expires = row
+        return CacheEntry(
+            url,
+            decompress(encoding, body),
+            etag,
+            last_modified,
+            expires
+        )
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        encoding, body = compress(entry.value)
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, '
+                '?, ?)',
+                (key, entry.url, body, encoding, entry.etag,
+                 entry.last_modified, entry.expires, time.time())
+            )
+            connection.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM '
+                'responses ORDER BY stored DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Only updates responses that are still stored.
+_REFRESH_SCRIPT = '''
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'etag', ARGV[1], 'last_modified', ARGV[2],
+               'expires', ARGV[3])
+    redis.call('PEXPIREAT', KEYS[1], ARGV[4])
+end
+'''
+
+# Only releases the lock if it wasn't taken over after expiring.
+_UNLOCK_SCRIPT = '''
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+'''
+
+
+class RedisStorage(Storage):
+    """Keeps response bodies in Redis, or any server speaking its protocol
+    such as Valkey, shared by clients on every host using it.
+
+    When a response isn't stored or has gone stale, only one client
+    fetches it from the API. The others wait for it to be stored, or keep
+    returning the stale response if its :class:`CachePolicy` allows.
+
+    Bodies are compressed with zstd when it's installed, zlib otherwise.
+    Requires ``redis``, installable with
+    ``pip install FortniteAPIAsync[redis]``.
+
+    Attributes
+    ----------
+    client: :class:`redis.asyncio.Redis`
+        The client in use, created from ``url`` if not given.
+    prefix: :class:`str`
+        Prepended to every key, to share a server with other data.
+    retention: :class:`float`
+        Seconds responses are kept after going stale, so they can still be
+        revalidated or returned while being refreshed.
+    """
+
+    def __init__(self,
+                 url: str = 'redis://localhost:6379',
+                 client: 'aioredis.Redis' = None,
+                 prefix: str = 'FortniteAPIAsync:',
+                 retention: float = 86400.0
+                 ) -> None:
+        if aioredis is None:
+            raise RuntimeError(
+                'redis is required for RedisStorage, install it with '
+                '`pip install FortniteAPIAsync[redis]`.'
+            )
+
+        super().__init__()
+        self._owns_client = client is None
+        self.client = client or aioredis.Redis.from_url(url)
+        self.prefix = prefix
+        self.retention = retention
+
+    @property
+    def exceptions(self) -> Tuple[Type[BaseException], ...]:
+        return (aioredis.RedisError, OSError)
+
+    async def lock(self, key: str, token: str, timeout: float) -> bool:
+        try:
+            return bool(await self.client.set(
+                f'{self.prefix}lock:{key}',
+                token,
+                nx=True,
+                px=max(int(timeout * 1000), 1)
+            ))
+        except self.exceptions:
+            # Fetching without the lock beats not fetching at all.
+            self.errors += 1
+            return True
+
+    async def locked(self, key: str) -> bool:
+        try:
+            return bool(await self.client.exists(f'{self.prefix}lock:{key}'))
+        except self.exceptions:
+            self.errors += 1
+            return False
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(f'{self.prefix}*')]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        await super().close()
+        if self._owns_client:
+            # Reconnects on its own when used again.
+            await self.client.connection_pool.disconnect()
+
+    async def _get(self,
+                   key: str,
+                   newer_than: float
+                   ) -> Optional[CacheEntry]:
+        # Bodies can be large, only fetched if it's worth it.
+        expires, = await self.client.hmget(self.prefix + key, 'expires')
+        if expires is None or float(expires) <= newer_than:
+            return None
+
+        fields = await self.client.hgetall(self.prefix + key)
+        if b'body' not in fields:
+            return None
+
+        body = await asyncio.get_running_loop().run_in_executor(
+            None,
+            decompress,
+            fields[b'encoding'].decode(),
+            fields[b'body']
+        )
+        return CacheEntry(
+            fields[b'url'].decode(),
+            body,
+            fields[b'etag'].decode() or None,
+            fields[b'last_modified'].decode() or None,
+            float(fields[b'expires'])
+        )
+
+    async def _set(self, key: str, entry: CacheEntry) -> None:
+        # Large bodies take a while to compress, off the event loop.
+        encoding, body = await asyncio.get_running_loop().run_in_executor(
+            None,
+            compress,
+            entry.value
+        )
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.prefix + key)
+            pipe.hset(self.prefix + key, mapping={
+                'url': entry.url,
+                'body': body,
+                'encoding': encoding,
+                'etag': entry.etag or '',
+                'last_modified': entry.last_modified or '',
+                'expires': repr(entry.expires)
+            })
+            pipe.pexpireat(self.prefix + key, self._evict_at(entry))
+            await pipe.execute()
+
+    async def _refresh(self, key: str, entry: CacheEntry) -> None:
+        await self.client.eval(
+            _REFRESH_SCRIPT,
+            1,
+            self.prefix + key,
+            entry.etag or '',
+            entry.last_modified or '',
+            repr(entry.expires),
+            self._evict_at(entry)
+        )
+
+    async def _unlock(self, key: str, token: str) -> None:
+        await self.client.eval(
+            _UNLOCK_SCRIPT,
+            1,
+            f'{self.prefix}lock:{key}',
+            token
+        )
+
+    def _evict_at(self, entry: CacheEntry) -> int:
+        return int((max(entry.expires, time.time()) + self.retention) * 1000)
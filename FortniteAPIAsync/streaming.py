@@ -0,0 +1,104 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+import re
+
+
+# A complete string, a structural character or the start of a string
+# which hasn't been fully received yet.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.S)
+# Everything up to the next structural character, skipping over strings.
+_SKIP = re.compile(
+    rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*',
+    re.S
+)
+
+
+class _ItemSplitter:
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._stack: List[int] = []
+        self._keys: List[Optional[str]] = []
+        self._key: Optional[str] = None
+        self._start: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[Tuple[Optional[str], bytes]]:
+        buffer = self._buffer
+        buffer += chunk
+        items = []
+
+        while True:
+            if self._start is None:
+                match = _TOKEN.search(buffer, self._position)
+                if match is None:
+                    self._position = len(buffer)
+                    break
+
+                token = match.group()
+                if token == b'"':
+                    self._position = match.start()
+                    break
+
+                if token[0] == 34:
+                    # Only the last string before a container matters,
+                    # that's the key it's stored under.
+                    if self._keys:
+                        self._keys[-1] = token[1:-1].decode()
+                    self._position = match.end()
+                    continue
+
+                index = match.start()
+            else:
+                index = _SKIP.match(buffer, self._position).end()
+                if index >= len(buffer) or buffer[index] == 34:
+                    self._position = index
+                    break
+
+            char = buffer[index]
+            self._position = index + 1
+
+            if char in b'{[':
+                stack = self._stack
+                if (self._start is None and len(stack) == self.depth
+                        and stack[-1] == 91):
+                    self._start = index
+                elif char == 91 and len(stack) + 1 == self.depth:
+                    self._key = self._keys[-1] if self._keys else None
+
+                stack.append(char)
+                self._keys.append(None)
+            else:
+                self._stack.pop()
+                self._keys.pop()
+
+                if (self._start is not None
+                        and len(self._stack) == self.depth):
+                    items.append(
+                        (self._key, bytes(buffer[self._start:index + 1]))
+                    )
+                    self._start = None
+
+        cut = self._position if self._start is None else self._start
+        del buffer[:cut]
+        self._position -= cut
+        if self._start is not None:
+            self._start -= cut
+
+        return items
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes],
+                           depth: int
+                           ) -> AsyncIterator[Tuple[Optional[str], bytes]]:
+    """Incrementally splits a streamed JSON document into the raw bytes
+    of every element of the arrays nested ``depth`` containers deep, along
+    with the key each array is stored under.
+
+    Only the element currently being received is kept in memory.
+    """
+    splitter = _ItemSplitter(depth)
+    async for chunk in chunks:
+        for item in splitter.feed(chunk):
+            yield item
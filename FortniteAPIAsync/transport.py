@@ -0,0 +1,280 @@
+from .pool import PoolConfig, session_registry
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Mapping, Tuple, Type
+
+import aiohttp
+import asyncio
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TransportResponse(ABC):
+    """Represents a response as returned by a :class:`Transport`.
+
+    Bodies are returned as received, without being decompressed.
+
+    Attributes
+    ----------
+    status: :class:`int`
+        The HTTP status code.
+    headers: Mapping[:class:`str`, :class:`str`]
+        Case-insensitive response headers.
+    content_type: :class:`str`
+        The MIME type of the body, without parameters.
+    """
+
+    def __init__(self, status: int, headers: Mapping[str, str]) -> None:
+        self.status = status
+        self.headers = headers
+        self.content_type = headers.get(
+            'Content-Type',
+            'application/octet-stream'
+        ).split(';')[0].strip().lower()
+
+    @abstractmethod
+    async def read(self) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self) -> None:
+        raise NotImplementedError
+
+
+class Transport(ABC):
+    """Base class for the HTTP backends used by :class:`HTTPClient`.
+
+    Attributes
+    ----------
+    errors: :class:`tuple`[:class:`type`]
+        Exceptions raised by the backend for connection level failures,
+        these are retried like timeouts.
+    """
+
+    errors: Tuple[Type[BaseException], ...] = ()
+
+    @abstractmethod
+    async def open(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def request(self,
+                      method: str,
+                      url: str,
+                      params: dict = None,
+                      headers: dict = None,
+                      **kwargs: Any
+                      ) -> TransportResponse:
+        raise NotImplementedError
+
+    async def warm_up(self, url: str, headers: dict, connections: int) -> None:
+        async def _open() -> None:
+            try:
+                response = await self.request('HEAD', url, headers=headers)
+                await response.release()
+            except (*self.errors, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*(_open() for _ in range(connections)))
+
+
+class _AiohttpResponse(TransportResponse):
+    def __init__(self, response: aiohttp.ClientResponse) -> None:
+        super().__init__(response.status, response.headers)
+        self._response = response
+
+    async def read(self) -> bytes:
+        return await self._response.read()
+
+    def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        return self._response.content.iter_chunked(chunk_size)
+
+    async def release(self) -> None:
+        self._response.release()
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 transport backed by :class:`aiohttp.ClientSession`, this is
+    the default.
+
+    Attributes
+    ----------
+    session: Optional[:class:`aiohttp.ClientSession`]
+        The session in use, ``None`` until the transport is opened.
+    pool: :class:`PoolConfig`
+        Connection pool settings used when creating a session.
+    shared_session: :class:`bool`
+        Whether the session is borrowed from :class:`SessionRegistry`.
+    """
+
+    errors = (aiohttp.ClientError,)
+
+    def __init__(self,
+                 session: aiohttp.ClientSession = None,
+                 pool: PoolConfig = None,
+                 shared_session: bool = False
+                 ) -> None:
+        self.session = session
+        self.pool = pool or PoolConfig()
+        self.shared_session = shared_session and session is None
+
+    async def open(self) -> None:
+        if self.session and not self.session.closed:
+            return
+
+        if self.shared_session:
+            self.session = await session_registry.acquire(self.pool)
+        else:
+            self.session = aiohttp.ClientSession(
+                connector=self.pool.create_connector()
+            )
+
+    async def close(self) -> None:
+        if self.session:
+            if self.shared_session:
+                await session_registry.release(self.session)
+            else:
+                await self.session.close()
+            self.session = None
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      params: dict = None,
+                      headers: dict = None,
+                      **kwargs: Any
+                      ) -> TransportResponse:
+        await self.open()
+        response = await self.session.request(
+            method=method,
+            url=url,
+            params=params,
+            headers=headers,
+            allow_redirects=method != 'HEAD',
+            # Decompressed by HTTPClient so both sides can be measured.
+            auto_decompress=False,
+            **kwargs
+        )
+        return _AiohttpResponse(response)
+
+    async def warm_up(self, url: str, headers: dict, connections: int) -> None:
+        # Requests have to be in flight at the same time, otherwise the
+        # connector would hand the same keep-alive connection to each one.
+        limits = [
+            limit for limit in (self.pool.limit, self.pool.limit_per_host)
+            if limit
+        ]
+        await super().warm_up(url, headers, min([connections, *limits]))
+
+
+class _HTTPXResponse(TransportResponse):
+    def __init__(self, response: 'httpx.Response') -> None:
+        super().__init__(response.status_code, response.headers)
+        self._response = response
+
+    async def read(self) -> bytes:
+        # Raw bytes, httpx would otherwise decompress the body itself.
+        return b''.join([chunk async for chunk in self._response.aiter_raw()])
+
+    def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        return self._response.aiter_raw(chunk_size)
+
+    async def release(self) -> None:
+        await self._response.aclose()
+
+
+class HTTPXTransport(Transport):
+    """HTTP/2 transport backed by :class:`httpx.AsyncClient`, multiplexing
+    concurrent requests over a single connection.
+
+    Requires ``httpx`` with HTTP/2 support, installable with
+    ``pip install FortniteAPIAsync[http2]``.
+
+    Attributes
+    ----------
+    client: Optional[:class:`httpx.AsyncClient`]
+        The client in use, ``None`` until the transport is opened.
+    pool: :class:`PoolConfig`
+        Connection pool settings used when creating a client, DNS settings
+        are not supported.
+    http2: :class:`bool`
+        Whether HTTP/2 is negotiated, falling back to HTTP/1.1 if the
+        server doesn't support it.
+    """
+
+    def __init__(self,
+                 client: 'httpx.AsyncClient' = None,
+                 pool: PoolConfig = None,
+                 http2: bool = True
+                 ) -> None:
+        if httpx is None:
+            raise RuntimeError(
+                'httpx is required for HTTPXTransport, install it with '
+                '`pip install FortniteAPIAsync[http2]`.'
+            )
+
+        self.client = client
+        self.pool = pool or PoolConfig()
+        self.http2 = http2
+
+    @property
+    def errors(self) -> Tuple[Type[BaseException], ...]:
+        return (httpx.TransportError,)
+
+    async def open(self) -> None:
+        if self.client and not self.client.is_closed:
+            return
+
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.pool.limit or None,
+                max_keepalive_connections=self.pool.limit or None,
+                keepalive_expiry=self.pool.keepalive_timeout
+            ),
+            # Deadlines are enforced by HTTPClient.
+            timeout=None
+        )
+
+    async def close(self) -> None:
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      params: dict = None,
+                      headers: dict = None,
+                      **kwargs: Any
+                      ) -> TransportResponse:
+        await self.open()
+        # Enum flags would otherwise be sent by name on older Pythons.
+        params = {
+            key: int(value) if isinstance(value, int) else value
+            for key, value in (params or {}).items()
+        }
+        request = self.client.build_request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            **kwargs
+        )
+        response = await self.client.send(request, stream=True)
+        return _HTTPXResponse(response)
+
+    async def warm_up(self, url: str, headers: dict, connections: int) -> None:
+        # Every request shares the same connection with HTTP/2.
+        await super().warm_up(url, headers, 1 if self.http2 else connections)
@@ -1,4 +1,53 @@
 from .enums import ResponseFlags
 
+from typing import Any, Callable
+
+import json
+
+
 def combine_flags(flags: list[ResponseFlags]) -> int:
     return sum(flags, ResponseFlags.NONE)
+
+
+def canonical_params(params: dict = None) -> tuple:
+    return tuple(sorted(
+        (str(key), str(value)) for key, value in (params or {}).items()
+    ))
+
+
+def endpoint_family(url: str) -> str:
+    return '/'.join(url.split('?')[0].split('/')[:3])
+
+
+class ListOf:
+    # Parses a list of objects into models, comparable so requests using
+    # it can be coalesced and cached together.
+    def __init__(self, model: Callable[[Any], Any]) -> None:
+        self.model = model
+
+    def __call__(self, data: list) -> list:
+        return [self.model(item) for item in data]
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ListOf) and other.model is self.model
+
+    def __hash__(self) -> int:
+        return hash((ListOf, self.model))
+
+
+def find_json_loads() -> Callable[[bytes], Any]:
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        return msgspec.json.decode
+
+    return json.loads
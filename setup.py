@@ -26,6 +26,19 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=[
-        'aiohttp',
+        'aiohttp>=3.10',
     ],
+    extras_require={
+        'speedups': [
+            'orjson',
+            'Brotli',
+            'zstandard',
+        ],
+        'http2': [
+            'httpx[http2]',
+        ],
+        'redis': [
+            'redis>=4.2',
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,35 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from collections import Counter
+from typing import Awaitable, Callable
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class APIServer:
+    """Local stand-in for the API, counts the requests each path gets."""
+
+    def __init__(self) -> None:
+        self.app = web.Application()
+        self.hits: Counter = Counter()
+        self._server = None
+
+    def route(self, path: str, handler: Handler) -> None:
+        async def counted(request: web.Request) -> web.StreamResponse:
+            self.hits[path] += 1
+            return await handler(request)
+
+        self.app.router.add_get(path, counted)
+
+    async def start(self) -> str:
+        self._server = TestServer(self.app)
+        await self._server.start_server()
+        return str(self._server.make_url('')).rstrip('/')
+
+    async def close(self) -> None:
+        if self._server is not None:
+            await self._server.close()
+
+
+def json_response(data: dict, **kwargs) -> web.Response:
+    return web.json_response({'status': 200, 'data': data}, **kwargs)
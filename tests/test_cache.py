@@ -0,0 +1,122 @@
+from FortniteAPIAsync import CachePolicy, ResponseCache, Shop
+from FortniteAPIAsync.http import HTTPClient
+
+from aiohttp import web
+from server import APIServer, json_response
+
+import asyncio
+import unittest
+
+
+class CacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+        self.version = 1
+
+        async def build(request):
+            return json_response({'version': self.version})
+
+        async def tagged(request):
+            etag = f'"{self.version}"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers={'ETag': etag})
+            return json_response(
+                {'version': self.version},
+                headers={'ETag': etag}
+            )
+
+        async def shop(request):
+            return json_response({
+                'hash': f'hash-{self.version}',
+                'date': '2024-01-01T00:00:00Z',
+                'entries': []
+            })
+
+        self.server.route('/v2/build', build)
+        self.server.route('/v2/shop', shop)
+        self.server.route('/v2/tagged', tagged)
+        self.url = await self.server.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.http.close()
+        await self.server.close()
+
+    def client(self, policy: CachePolicy = None, **kwargs) -> HTTPClient:
+        policies = {'/v2/build': policy} if policy is not None else None
+        self.http = HTTPClient(
+            base=self.url,
+            cache=ResponseCache(policies=policies, **kwargs)
+        )
+        return self.http
+
+    async def test_only_revalidates_by_default(self) -> None:
+        http = self.client()
+        await http.api_request('/v2/build')
+        await http.api_request('/v2/build')
+
+        self.assertEqual(self.server.hits['/v2/build'], 2)
+        self.assertEqual(len(http.cache), 0)
+
+    async def test_not_modified_returns_same_object(self) -> None:
+        http = self.client()
+        first = await http.api_request('/v2/tagged')
+        self.assertIs(await http.api_request('/v2/tagged'), first)
+
+        self.version = 2
+        self.assertEqual(
+            await http.api_request('/v2/tagged'),
+            {'version': 2}
+        )
+        self.assertEqual(self.server.hits['/v2/tagged'], 3)
+        self.assertEqual(http.cache.revalidated, 1)
+
+    async def test_same_content_hash_returns_same_object(self) -> None:
+        http = self.client()
+        first = await http.api_request('/v2/shop', parse=Shop)
+        self.assertIs(await http.api_request('/v2/shop', parse=Shop), first)
+        self.assertEqual(http.cache.unchanged, 1)
+
+        self.version = 2
+        shop = await http.api_request('/v2/shop', parse=Shop)
+        self.assertIsNot(shop, first)
+        self.assertEqual(shop.hash, 'hash-2')
+        self.assertEqual(self.server.hits['/v2/shop'], 3)
+
+    async def test_max_bytes(self) -> None:
+        http = self.client(CachePolicy(ttl=60.0), max_bytes=100)
+        for version in range(3):
+            await http.api_request('/v2/build', params={'v': version})
+
+        # Each body is about 40 bytes, the oldest one is dropped.
+        self.assertEqual(len(http.cache), 2)
+        self.assertLessEqual(http.cache.size, 100)
+
+    async def test_expired_response_is_fetched_again(self) -> None:
+        http = self.client(CachePolicy(ttl=0.1, early_refresh=0.0))
+        self.assertEqual(await http.api_request('/v2/build'), {'version': 1})
+
+        self.version = 2
+        self.assertEqual(await http.api_request('/v2/build'), {'version': 1})
+        await asyncio.sleep(0.15)
+        self.assertEqual(await http.api_request('/v2/build'), {'version': 2})
+        self.assertEqual(http.cache.stale, 0)
+
+    async def test_stale_while_revalidate(self) -> None:
+        http = self.client(CachePolicy(
+            ttl=0.1,
+            stale_while_revalidate=60.0,
+            early_refresh=0.0
+        ))
+        await http.api_request('/v2/build')
+
+        self.version = 2
+        await asyncio.sleep(0.15)
+        # The stale response is returned while it's refreshed.
+        self.assertEqual(await http.api_request('/v2/build'), {'version': 1})
+        await asyncio.sleep(0.05)
+        self.assertEqual(await http.api_request('/v2/build'), {'version': 2})
+        self.assertEqual(self.server.hits['/v2/build'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
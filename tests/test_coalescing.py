@@ -0,0 +1,72 @@
+from FortniteAPIAsync import DeadlineExceeded
+from FortniteAPIAsync.http import HTTPClient
+
+from server import APIServer, json_response
+
+import asyncio
+import unittest
+
+
+class CoalescingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+
+        async def item(request):
+            await asyncio.sleep(0.1)
+            return json_response({'id': request.query.get('id')})
+
+        async def slow(request):
+            await asyncio.sleep(5)
+            return json_response({})
+
+        self.server.route('/v2/item', item)
+        self.server.route('/v2/stats/slow', slow)
+        self.http = HTTPClient(base=await self.server.start())
+
+    async def asyncTearDown(self) -> None:
+        await self.http.close()
+        await self.server.close()
+
+    async def test_identical_requests_share_one_request(self) -> None:
+        results = await asyncio.gather(*[
+            self.http.api_request('/v2/item', params={'id': '1'})
+            for _ in range(10)
+        ])
+
+        self.assertEqual(self.server.hits['/v2/item'], 1)
+        self.assertEqual(self.http.coalesced_requests, 9)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_different_params_are_not_shared(self) -> None:
+        await asyncio.gather(
+            self.http.api_request('/v2/item', params={'id': '1'}),
+            self.http.api_request('/v2/item', params={'id': '2'})
+        )
+
+        self.assertEqual(self.server.hits['/v2/item'], 2)
+
+    async def test_retry_after_timeout_starts_new_request(self) -> None:
+        # The first request is still being cancelled when the retry comes
+        # in, it mustn't be joined.
+        with self.assertRaises(DeadlineExceeded):
+            await self.http.api_request('/v2/stats/slow', timeout=0.3)
+        with self.assertRaises(DeadlineExceeded):
+            await self.http.api_request('/v2/stats/slow', timeout=0.3)
+
+    async def test_remaining_caller_keeps_request(self) -> None:
+        # One caller giving up doesn't cancel the request for the others.
+        patient = asyncio.ensure_future(
+            self.http.api_request('/v2/item', params={'id': '1'})
+        )
+        impatient = asyncio.ensure_future(
+            self.http.api_request('/v2/item', params={'id': '1'})
+        )
+        await asyncio.sleep(0.02)
+        impatient.cancel()
+
+        self.assertEqual((await patient)['id'], '1')
+        self.assertEqual(self.server.hits['/v2/item'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+from FortniteAPIAsync import DeadlineExceeded
+from FortniteAPIAsync.http import HTTPClient
+
+from server import APIServer, json_response
+
+import asyncio
+import time
+import unittest
+
+
+class DeadlineTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+
+        async def stats(request):
+            await asyncio.sleep(0.6)
+            return json_response({'name': request.query.get('name')})
+
+        self.server.route('/v2/stats/br/v2', stats)
+        self.http = HTTPClient(base=await self.server.start())
+
+    async def asyncTearDown(self) -> None:
+        await self.http.close()
+        await self.server.close()
+
+    async def test_deadline_exceeded(self) -> None:
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            await self.http.api_request('/v2/stats/br/v2', timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        # Running out of time isn't the endpoint's fault.
+        self.assertFalse(self.http.circuit_breaker._circuits)
+
+    async def test_coalesced_caller_extends_deadline(self) -> None:
+        for _ in range(3):
+            impatient = asyncio.ensure_future(
+                self.http.api_request('/v2/stats/br/v2', timeout=0.3)
+            )
+            # Joins once the request has been sent.
+            await asyncio.sleep(0.05)
+            patient = asyncio.ensure_future(
+                self.http.api_request('/v2/stats/br/v2', timeout=1.0)
+            )
+
+            with self.assertRaises(DeadlineExceeded):
+                await impatient
+            self.assertEqual(await patient, {'name': None})
+
+        # The request kept going for the patient caller instead of timing
+        # out with the first one and being sent again.
+        self.assertEqual(self.server.hits['/v2/stats/br/v2'], 3)
+        self.assertFalse(self.http.circuit_breaker._circuits)
+
+
+if __name__ == '__main__':
+    unittest.main()
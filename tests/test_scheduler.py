@@ -0,0 +1,76 @@
+from FortniteAPIAsync import Priority, RequestScheduler
+
+import asyncio
+import unittest
+
+
+class FairQueuingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_tenants_take_turns(self) -> None:
+        scheduler = RequestScheduler(limit=1)
+        held = await scheduler.acquire(tenant='a')
+        order = []
+
+        async def request(tenant):
+            ticket = await scheduler.acquire(tenant=tenant)
+            order.append(tenant)
+            scheduler.release(ticket)
+
+        tasks = [
+            asyncio.ensure_future(request(tenant))
+            for tenant in ['a'] * 4 + ['b'] * 4
+        ]
+        await asyncio.sleep(0)
+        scheduler.release(held)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order, ['a', 'b'] * 4)
+
+    async def test_uncontended_requests_build_no_backlog(self) -> None:
+        scheduler = RequestScheduler(limit=2)
+        for _ in range(500):
+            scheduler.release(await scheduler.acquire(tenant='a'))
+
+        held = [await scheduler.acquire(tenant='b') for _ in range(2)]
+        order = []
+
+        async def request(tenant):
+            ticket = await scheduler.acquire(tenant=tenant)
+            order.append(tenant)
+            scheduler.release(ticket)
+
+        tasks = [
+            asyncio.ensure_future(request('b')) for _ in range(50)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(request('a')))
+        await asyncio.sleep(0)
+
+        for ticket in held:
+            scheduler.release(ticket)
+        await asyncio.gather(*tasks)
+
+        self.assertLess(order.index('a'), 3)
+
+    async def test_higher_priority_goes_first(self) -> None:
+        scheduler = RequestScheduler(limit=1)
+        held = await scheduler.acquire()
+        order = []
+
+        async def request(priority):
+            ticket = await scheduler.acquire(priority)
+            order.append(priority)
+            scheduler.release(ticket)
+
+        tasks = [
+            asyncio.ensure_future(request(priority))
+            for priority in (Priority.BACKGROUND, Priority.INTERACTIVE)
+        ]
+        await asyncio.sleep(0)
+        scheduler.release(held)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order, [Priority.INTERACTIVE, Priority.BACKGROUND])
+
+
+if __name__ == '__main__':
+    unittest.main()
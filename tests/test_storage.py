@@ -0,0 +1,169 @@
+from FortniteAPIAsync import (
+    CachePolicy,
+    RedisStorage,
+    ResponseCache,
+    SQLiteStorage,
+    Storage,
+    request_options
+)
+from FortniteAPIAsync.http import HTTPClient
+
+from server import APIServer, json_response
+
+import asyncio
+import os
+import secrets
+import tempfile
+import threading
+import unittest
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from fakeredis import TcpFakeServer
+except ImportError:
+    TcpFakeServer = None
+
+POLICIES = {'/v2/aes': CachePolicy(ttl=60.0)}
+
+
+class StorageTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+
+        self.build = '++Fortnite+Release-30.00'
+
+        async def aes(request):
+            await asyncio.sleep(0.2)
+            return json_response({'build': self.build})
+
+        self.server.route('/v2/aes', aes)
+        self.url = await self.server.start()
+        self.clients = []
+
+    async def asyncTearDown(self) -> None:
+        for http in self.clients:
+            await http.close()
+        await self.server.close()
+
+    def client(self, storage: Storage) -> HTTPClient:
+        http = HTTPClient(
+            base=self.url,
+            cache=ResponseCache(policies=POLICIES, storage=storage)
+        )
+        self.clients.append(http)
+        return http
+
+
+class SQLiteStorageTest(StorageTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.db')
+
+    async def test_restart_serves_stored_response(self) -> None:
+        http = self.client(SQLiteStorage(self.path))
+        data = await http.api_request('/v2/aes')
+        await http.close()
+
+        http = self.client(SQLiteStorage(self.path))
+        self.assertEqual(await http.api_request('/v2/aes'), data)
+        self.assertEqual(self.server.hits['/v2/aes'], 1)
+        self.assertEqual(http.cache.storage.reads, 1)
+
+    async def test_bypassing_cache_skips_storage(self) -> None:
+        http = self.client(SQLiteStorage(self.path))
+        await http.api_request('/v2/aes')
+        await http.close()
+
+        self.build = '++Fortnite+Release-31.00'
+        http = self.client(SQLiteStorage(self.path))
+        cached = asyncio.ensure_future(http.api_request('/v2/aes'))
+        with request_options(cache=False):
+            bypassed = asyncio.ensure_future(http.api_request('/v2/aes'))
+
+        self.assertEqual((await cached)['build'], '++Fortnite+Release-30.00')
+        self.assertEqual((await bypassed)['build'], self.build)
+        self.assertEqual(http.coalesced_requests, 0)
+
+    def test_incomplete_storage(self) -> None:
+        class Incomplete(Storage):
+            async def clear(self) -> None:
+                pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+@unittest.skipIf(redis is None, 'redis is not installed')
+class RedisStorageTest(StorageTestCase):
+    # Runs against REDIS_URL when set, an in-process stand-in otherwise.
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.redis_url = os.environ.get('REDIS_URL')
+        cls.fake_server = None
+        if cls.redis_url is not None:
+            return
+        if TcpFakeServer is None:
+            raise unittest.SkipTest('REDIS_URL is not set')
+
+        cls.fake_server = TcpFakeServer(
+            ('127.0.0.1', 0),
+            server_type='redis'
+        )
+        threading.Thread(
+            target=cls.fake_server.serve_forever,
+            daemon=True
+        ).start()
+        host, port = cls.fake_server.server_address
+        cls.redis_url = f'redis://{host}:{port}'
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls.fake_server is not None:
+            cls.fake_server.shutdown()
+            cls.fake_server.server_close()
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        # Tests don't see each other's responses.
+        self.prefix = f'FortniteAPIAsync-test-{secrets.token_hex(4)}:'
+
+    def redis_client(self) -> HTTPClient:
+        return self.client(RedisStorage(self.redis_url, prefix=self.prefix))
+
+    async def test_single_flight_across_clients(self) -> None:
+        clients = [self.redis_client() for _ in range(10)]
+        results = await asyncio.gather(*[
+            http.api_request('/v2/aes') for http in clients
+        ])
+
+        self.assertEqual(self.server.hits['/v2/aes'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertFalse(any(http.cache.storage.errors for http in clients))
+
+    async def test_stored_response_is_shared(self) -> None:
+        await self.redis_client().api_request('/v2/aes')
+        await self.redis_client().api_request('/v2/aes')
+
+        self.assertEqual(self.server.hits['/v2/aes'], 1)
+
+    async def test_lock_is_released(self) -> None:
+        storage = RedisStorage(self.redis_url, prefix=self.prefix)
+        self.addAsyncCleanup(storage.close)
+
+        self.assertTrue(await storage.lock('key', 'a', 5.0))
+        self.assertFalse(await storage.lock('key', 'b', 5.0))
+        # Only the holder can release it.
+        await storage.unlock('key', 'b')
+        self.assertTrue(await storage.locked('key'))
+        await storage.unlock('key', 'a')
+        self.assertFalse(await storage.locked('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
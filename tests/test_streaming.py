@@ -0,0 +1,173 @@
+from FortniteAPIAsync import APIClient, BRCosmetic, TrackCosmetic
+from FortniteAPIAsync.streaming import iter_array_items
+
+from aiohttp import web
+from server import APIServer
+
+import json
+import random
+import unittest
+
+
+def cosmetic(id: str, name: str) -> dict:
+    return {
+        'id': id,
+        'name': name,
+        'description': 'Has "quotes", a \\\\ backslash and {[brackets]}',
+        'type': {'value': 'outfit', 'displayValue': 'Outfit'},
+        'rarity': {'value': 'rare', 'displayValue': 'Rare'},
+        'images': {'icon': 'https://example.com/icon.png'},
+        'gameplayTags': ['Cosmetics.Set.[Odd]', 'Cosmetics.Filter{x}'],
+        'added': '2024-01-01T00:00:00Z'
+    }
+
+
+def track(id: str, title: str) -> dict:
+    return {
+        'id': id,
+        'devName': id,
+        'title': title,
+        'artist': 'Artist ] [',
+        'difficulty': {'vocals': 1, 'guitar': 2},
+        'albumArt': 'https://example.com/art.png',
+        'added': '2024-01-01T00:00:00Z'
+    }
+
+
+DATA = {
+    'br': [
+        cosmetic('CID_001', 'Renegade Raider'),
+        cosmetic('CID_002', 'Épée ✨ Ünïcödé'),
+        cosmetic('CID_003', '"]}{["'),
+    ],
+    # A string and a null between arrays aren't yielded.
+    'note': 'not an array: [{"id": "fake"}]',
+    'tracks': None,
+    'instruments': [],
+    'cars': [],
+    'lego': [{'id': 'Lego_1', 'nested': [[1, 2], [{'a': '['}]]}],
+    'extra': [track('Sparks_1', 'Sönġ \\"quoted\\"')],
+}
+PAYLOAD = json.dumps(
+    {'status': 200, 'data': DATA},
+    ensure_ascii=False
+).encode()
+EXPECTED = [
+    (key, item)
+    for key, value in DATA.items() if isinstance(value, list)
+    for item in value
+]
+
+
+async def chunked(payload: bytes, sizes):
+    position = 0
+    for size in sizes:
+        if position >= len(payload):
+            return
+        yield payload[position:position + size]
+        position += size
+    if position < len(payload):
+        yield payload[position:]
+
+
+class ItemSplitterTest(unittest.IsolatedAsyncioTestCase):
+    async def split(self, payload: bytes, sizes, depth: int = 3) -> list:
+        return [
+            (key, json.loads(raw))
+            async for key, raw in iter_array_items(
+                chunked(payload, sizes),
+                depth
+            )
+        ]
+
+    async def test_whole_payload(self) -> None:
+        self.assertEqual(await self.split(PAYLOAD, []), EXPECTED)
+
+    async def test_fixed_chunk_sizes(self) -> None:
+        for size in (1, 2, 3, 5, 7, 64):
+            with self.subTest(size=size):
+                sizes = [size] * (len(PAYLOAD) // size + 1)
+                self.assertEqual(await self.split(PAYLOAD, sizes), EXPECTED)
+
+    async def test_every_split_point(self) -> None:
+        # Covers boundaries inside escapes and multi-byte characters.
+        for index in range(len(PAYLOAD)):
+            self.assertEqual(
+                await self.split(PAYLOAD, [index]),
+                EXPECTED,
+                f'split at {index}'
+            )
+
+    async def test_random_chunks(self) -> None:
+        rng = random.Random(0)
+        for _ in range(100):
+            sizes = [rng.randint(1, 40) for _ in range(len(PAYLOAD))]
+            self.assertEqual(await self.split(PAYLOAD, sizes), EXPECTED)
+
+    async def test_top_level_array(self) -> None:
+        payload = json.dumps({
+            'status': 200,
+            'data': DATA['br']
+        }).encode()
+
+        items = await self.split(payload, [1] * len(payload), depth=2)
+        self.assertEqual(items, [('data', item) for item in DATA['br']])
+
+
+class IterAllTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+        payload = json.dumps({'status': 200, 'data': {
+            'br': DATA['br'],
+            'note': DATA['note'],
+            'tracks': [track('Sparks_1', 'Sönġ')],
+            'lego': None
+        }}, ensure_ascii=False).encode()
+
+        async def cosmetics(request):
+            # Sent in small uneven writes, like a slow connection.
+            response = web.StreamResponse(
+                headers={'Content-Type': 'application/json'}
+            )
+            await response.prepare(request)
+            for start in range(0, len(payload), 37):
+                await response.write(payload[start:start + 37])
+            await response.write_eof()
+            return response
+
+        self.server.route('/v2/cosmetics/', cosmetics)
+        self.client = APIClient(base=await self.server.start())
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def test_iter_all(self) -> None:
+        cosmetics = [
+            cosmetic async for cosmetic
+            in self.client.cosmetics.iter_all(chunk_size=16)
+        ]
+
+        self.assertEqual(
+            [type(cosmetic) for cosmetic in cosmetics],
+            [BRCosmetic] * 3 + [TrackCosmetic]
+        )
+        self.assertEqual(
+            [cosmetic.id for cosmetic in cosmetics],
+            ['CID_001', 'CID_002', 'CID_003', 'Sparks_1']
+        )
+        self.assertEqual(cosmetics[1].name, 'Épée ✨ Ünïcödé')
+        self.assertEqual(cosmetics[3].title, 'Sönġ')
+
+    async def test_iter_all_types(self) -> None:
+        cosmetics = [
+            cosmetic async for cosmetic
+            in self.client.cosmetics.iter_all(types=['tracks'])
+        ]
+
+        self.assertEqual([cosmetic.id for cosmetic in cosmetics], ['Sparks_1'])
+        self.assertIsInstance(cosmetics[0], TrackCosmetic)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+from FortniteAPIAsync import AiohttpTransport, HTTPXTransport, Transport
+from FortniteAPIAsync.http import HTTPClient
+
+from server import APIServer, json_response
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import unittest
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+except ImportError:
+    serve = None
+
+
+class TransportTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = APIServer()
+
+        async def aes(request):
+            return json_response({'build': request.headers['User-Agent']})
+
+        self.server.route('/v2/aes', aes)
+        self.url = await self.server.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.server.close()
+
+    async def check(self, transport: Transport) -> None:
+        http = HTTPClient(base=self.url, transport=transport)
+        try:
+            data = await http.api_request('/v2/aes')
+        finally:
+            await http.close()
+
+        self.assertTrue(data['build'].startswith('FortniteAPIAsync/'))
+
+    async def test_aiohttp(self) -> None:
+        await self.check(AiohttpTransport())
+
+    @unittest.skipIf(httpx is None, 'httpx is not installed')
+    async def test_httpx(self) -> None:
+        await self.check(HTTPXTransport())
+
+    def test_incomplete_transport(self) -> None:
+        class Incomplete(Transport):
+            async def open(self) -> None:
+                pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+@unittest.skipIf(serve is None, 'hypercorn is not installed')
+@unittest.skipIf(shutil.which('openssl') is None, 'openssl is not installed')
+class HTTP2TransportTest(unittest.IsolatedAsyncioTestCase):
+    # HTTP/2 is only negotiated over TLS, with a self-signed certificate.
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.certfile = os.path.join(cls.directory.name, 'cert.pem')
+        cls.keyfile = os.path.join(cls.directory.name, 'key.pem')
+        subprocess.run(
+            [
+                'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                '-days', '1', '-subj', '/CN=localhost',
+                '-keyout', cls.keyfile, '-out', cls.certfile
+            ],
+            check=True,
+            capture_output=True
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    async def asyncSetUp(self) -> None:
+        self.versions = []
+        self.connections = set()
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        config = Config()
+        config.bind = [f'127.0.0.1:{port}']
+        config.certfile = self.certfile
+        config.keyfile = self.keyfile
+        config.accesslog = None
+        config.errorlog = None
+
+        self.shutdown = asyncio.Event()
+        self.server = asyncio.ensure_future(
+            serve(self.app, config, shutdown_trigger=self.shutdown.wait)
+        )
+        self.url = f'https://127.0.0.1:{port}'
+        await self.wait_listening(port)
+
+    async def asyncTearDown(self) -> None:
+        self.shutdown.set()
+        await self.server
+
+    @staticmethod
+    async def wait_listening(port: int) -> None:
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection('127.0.0.1', port)
+            except OSError:
+                await asyncio.sleep(0.02)
+            else:
+                writer.close()
+                return
+        raise RuntimeError('hypercorn did not start')
+
+    async def app(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                await send({'type': message['type'] + '.complete'})
+                if message['type'] == 'lifespan.shutdown':
+                    return
+
+        self.versions.append(scope['http_version'])
+        self.connections.add(tuple(scope['client']))
+        # Overlaps the requests so they have to be multiplexed.
+        await asyncio.sleep(0.1)
+        body = gzip.compress(json.dumps({
+            'status': 200,
+            'data': {'path': scope['path'], 'padding': 'x' * 4096}
+        }).encode())
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-encoding', b'gzip')
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def test_http2(self) -> None:
+        transport = HTTPXTransport(
+            client=httpx.AsyncClient(http2=True, verify=False)
+        )
+        http = HTTPClient(base=self.url, transport=transport)
+        try:
+            results = await asyncio.gather(*[
+                http.api_request('/v2/aes', params={'n': n})
+                for n in range(5)
+            ])
+        finally:
+            await http.close()
+
+        self.assertEqual(self.versions, ['2'] * 5)
+        self.assertEqual(len(self.connections), 1)
+        self.assertTrue(all(data['path'] == '/v2/aes' for data in results))
+
+        stats = http.transfer_stats['/v2/aes']
+        self.assertEqual(stats.responses, 5)
+        self.assertEqual(stats.encodings, {'gzip': 5})
+        self.assertGreater(stats.decoded_bytes, stats.wire_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()